@@ -0,0 +1,91 @@
+"""
+Duck game collision stress benchmark.
+
+Measures the per-frame cost of moving every food item and resolving
+duck/food collisions at increasing food counts, for the old full list scan,
+the spatial grid (FoodGrid) and the NumPy struct-of-arrays FoodSwarm.
+The collision columns isolate the collision phase.
+
+Usage: python benchmarks/bench_duck_collision.py [--frames N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import duck_game
+from duck_game import Duck, Food, FoodGrid, FoodSwarm, check_collision
+
+FOOD_COUNTS = [10, 100, 1000, 5000, 20000, 50000]
+
+
+def make_duck():
+    duck = Duck()
+    duck.size = 60
+    duck.has_straw = True
+    return duck
+
+
+def list_update(foods):
+    for food in foods:
+        food.update()
+
+
+def list_collide(duck, foods):
+    # The original main loop: scan everything, remove from a list
+    for food in foods[:]:
+        if check_collision(duck, food):
+            foods.remove(food)
+            foods.append(Food())
+
+
+def container_update(foods):
+    foods.update()
+
+
+def container_collide(duck, foods):
+    foods.collect(duck)
+
+
+def time_frames(update, collide, duck, foods, frames):
+    update_time = collide_time = 0.0
+    for i in range(frames):
+        # Sweep the duck across the window so it keeps hitting food
+        duck.x = 100 + (i * 7) % (duck_game.WINDOW_WIDTH - 200)
+        start = time.perf_counter()
+        update(foods)
+        middle = time.perf_counter()
+        collide(duck, foods)
+        collide_time += time.perf_counter() - middle
+        update_time += middle - start
+    return (update_time + collide_time) / frames * 1000, collide_time / frames * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", type=int, default=60)
+    args = parser.parse_args()
+
+    print(f"{'foods':>8} {'list frame':>11} {'grid frame':>11} {'swarm frame':>12} "
+          f"{'list collide':>13} {'grid collide':>13} {'swarm collide':>14}   (ms)")
+    for count in FOOD_COUNTS:
+        row = []
+        random.seed(count)
+        foods = [Food() for _ in range(count)]
+        row.append(time_frames(list_update, list_collide, make_duck(), foods, args.frames))
+
+        random.seed(count)
+        row.append(time_frames(container_update, container_collide, make_duck(), FoodGrid(count), args.frames))
+        row.append(time_frames(container_update, container_collide, make_duck(), FoodSwarm(count), args.frames))
+
+        frames = " ".join(f"{frame_ms:>11.3f}" for frame_ms, _ in row)
+        collides = " ".join(f"{collide_ms:>13.3f}" for _, collide_ms in row)
+        print(f"{count:>8} {frames} {collides}")
+
+if __name__ == "__main__":
+    main()
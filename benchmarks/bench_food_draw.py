@@ -0,0 +1,97 @@
+"""
+Duck game food draw-phase micro-benchmark.
+
+Compares drawing 1k food items the old way (a new Font and a text render
+per item per frame) against the pre-baked sprite cache, drawn one blit per
+item and as a single batched Surface.blits call. Then draws a FoodSwarm of
+--swarm-foods items (the `--swarm` engine) with every item blitted against
+FoodSwarm.draw, which skips the items hidden under later ones.
+
+Usage: python benchmarks/bench_food_draw.py [--foods N] [--swarm-foods N] [--frames N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+import duck_game
+from duck_game import Food, FoodSwarm, draw_foods, get_food_sprite, prebake_food_sprites
+
+
+def legacy_draw(screen, food):
+    # Food.draw before the sprite cache
+    pygame.draw.circle(screen, duck_game.RED, (food.x, food.y), food.size)
+    font = pygame.font.Font(None, 28)
+    text = font.render(str(food.score), True, duck_game.WHITE)
+    screen.blit(text, text.get_rect(center=(food.x, food.y)))
+
+
+def draw_legacy(screen, foods):
+    for food in foods:
+        legacy_draw(screen, food)
+
+
+def draw_per_item(screen, foods):
+    for food in foods:
+        food.draw(screen)
+
+
+def draw_swarm_unculled(screen, swarm):
+    # FoodSwarm.draw without the occlusion culling
+    x = swarm.x - swarm.size
+    y = swarm.y - swarm.size
+    screen.blits([(get_food_sprite(score, size), (left, top))
+                  for left, top, size, score in zip(x.tolist(), y.tolist(), swarm.size.tolist(),
+                                                    swarm.score.tolist())])
+
+
+def draw_swarm(screen, swarm):
+    swarm.draw(screen)
+
+
+def time_draw(draw, screen, foods, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        screen.fill(duck_game.BLUE)
+        draw(screen, foods)
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--foods", type=int, default=1000)
+    parser.add_argument("--swarm-foods", type=int, default=50000)
+    parser.add_argument("--frames", type=int, default=60)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((duck_game.WINDOW_WIDTH, duck_game.WINDOW_HEIGHT))
+    random.seed(0)
+    foods = [Food() for _ in range(args.foods)]
+    prebake_food_sprites()
+
+    legacy_ms = time_draw(draw_legacy, screen, foods, args.frames)
+    print(f"{args.foods} foods, ms per frame")
+    print(f"  {'before (font + render per item)':<36} {legacy_ms:>8.3f}")
+    for label, draw in [("sprite cache, blit per item", draw_per_item),
+                        ("sprite cache, batched blits", draw_foods)]:
+        ms = time_draw(draw, screen, foods, args.frames)
+        print(f"  {label:<36} {ms:>8.3f}  ({legacy_ms / ms:.1f}x)")
+
+    swarm = FoodSwarm(args.swarm_foods, seed=0)
+    unculled_ms = time_draw(draw_swarm_unculled, screen, swarm, args.frames)
+    print(f"{args.swarm_foods} foods (--swarm), ms per frame")
+    print(f"  {'blit every item':<36} {unculled_ms:>8.3f}")
+    ms = time_draw(draw_swarm, screen, swarm, args.frames)
+    print(f"  {'FoodSwarm.draw (hidden items culled)':<36} {ms:>8.3f}  ({unculled_ms / ms:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
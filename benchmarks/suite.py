@@ -0,0 +1,342 @@
+"""
+Headless benchmark suite for the games' hot paths.
+
+Runs every case under SDL_VIDEODRIVER=dummy, writes the results to a JSON
+file and compares them against a stored baseline. A case regresses when its
+median time per call is more than --threshold (default 25%) slower than
+the baseline; any regression makes the suite exit with status 1.
+
+Usage:
+    python benchmarks/suite.py                      # run, compare with baseline.json
+    python benchmarks/suite.py --save-baseline      # run and store a new baseline
+    python benchmarks/suite.py --filter duck_       # only cases whose name contains duck_
+
+Baselines are machine specific: regenerate baseline.json on the machine that
+runs the comparison before relying on the pass/fail result.
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import numpy as np
+import pygame
+
+import duck_game
+import heart_curve
+import math_curves
+import spaceship_assembly
+from trail_buffer import TrailBuffer
+from trail_lod import DecimatedTrail
+from trail_render import TRAIL_RENDERERS
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, "results.json")
+DUCK_FOOD_COUNTS = [100, 1000, 5000]
+
+
+def make_screen(size):
+    return pygame.display.set_mode(size)
+
+
+# Each setup function prepares its fixtures and returns the call to time.
+
+def setup_turtle_draw(render_mode="batched"):
+    def setup():
+        screen = make_screen((heart_curve.WINDOW_WIDTH, heart_curve.WINDOW_HEIGHT))
+        turtle = heart_curve.Turtle()
+        turtle.set_render_mode(render_mode)
+        t = 0.0
+        while len(turtle.trail) < 1000:
+            turtle.move_to(*heart_curve.heart_curve(t, 10))
+            t += 0.02
+        return lambda: turtle.draw(screen)
+    return setup
+
+
+def setup_curve_explorer_draw(render_mode="batched"):
+    def setup():
+        screen = make_screen((math_curves.WINDOW_WIDTH, math_curves.WINDOW_HEIGHT))
+        explorer = math_curves.CurveExplorer()
+        explorer.set_render_mode(render_mode)
+        explorer.current_curve = '4'  # the spiral is long enough for a full 2000-point trail
+        explorer.speed = 0.01
+        while len(explorer.trail) < 2000:
+            explorer.update(1 / 60)
+        return lambda: explorer.draw(screen)
+    return setup
+
+
+def setup_curve_canvas_frame():
+    # Incremental mode: one new segment plus the canvas blit, independent of trail length
+    screen = make_screen((math_curves.WINDOW_WIDTH, math_curves.WINDOW_HEIGHT))
+    explorer = math_curves.CurveExplorer()
+    explorer.current_curve = '4'
+    explorer.speed = 0.01
+    while len(explorer.trail) < 2000:
+        explorer.update(1 / 60)
+    explorer.set_incremental(True)
+    points = itertools.cycle(explorer.trail.view().tolist())
+    canvas = explorer.canvas
+
+    def frame():
+        canvas.add_point(*next(points))
+        canvas.draw(screen)
+    return frame
+
+
+def setup_trail_append():
+    # Append to a full million-point trail: constant time, no allocation
+    trail = TrailBuffer(1_000_000)
+    for i in range(trail.capacity):
+        trail.append(i, i)
+    return lambda: trail.append(1.0, 2.0)
+
+
+def spiral_points(count):
+    # A long Archimedean spiral filling the curves window, count raw samples
+    t = np.linspace(0, 60 * np.pi, count)
+    return np.column_stack((t * np.cos(t) * 2 + math_curves.WINDOW_WIDTH // 2,
+                            t * np.sin(t) * 2 + math_curves.WINDOW_HEIGHT // 2))
+
+
+def setup_lod_draw(render_mode="batched"):
+    # Full-history mode: the whole 100k-sample curve stays visible at bounded draw cost
+    def setup():
+        screen = make_screen((math_curves.WINDOW_WIDTH, math_curves.WINDOW_HEIGHT))
+        explorer = math_curves.CurveExplorer()
+        explorer.set_render_mode(render_mode)
+        explorer.set_unbounded(True)
+        explorer.trail.extend(spiral_points(100_000))
+        return lambda: explorer.draw(screen)
+    return setup
+
+
+def setup_dense_trail_draw(render_mode):
+    # 20000 points about a pixel apart: the per-point overhead of the line calls dominates
+    def setup():
+        screen = make_screen((math_curves.WINDOW_WIDTH, math_curves.WINDOW_HEIGHT))
+        render = TRAIL_RENDERERS[render_mode]
+        t = np.linspace(0, 8 * np.pi, 20_000)
+        points = np.column_stack((t * np.cos(t) * 15 + 600, t * np.sin(t) * 15 + 400))
+        return lambda: render(screen, points, math_curves.BLACK, math_curves.RED, 2)
+    return setup
+
+
+def setup_lod_append():
+    # Amortized append, including the periodic simplification of the oldest raw chunk
+    trail = DecimatedTrail()
+    points = itertools.cycle(spiral_points(100_000).tolist())
+    return lambda: trail.append(*next(points))
+
+
+def make_duck_foods(count):
+    random.seed(count)
+    return [duck_game.Food() for _ in range(count)]
+
+
+def setup_food_draw(count):
+    def setup():
+        screen = make_screen((duck_game.WINDOW_WIDTH, duck_game.WINDOW_HEIGHT))
+        foods = make_duck_foods(count)
+        duck_game.prebake_food_sprites()
+        return lambda: duck_game.draw_foods(screen, foods)
+    return setup
+
+
+def setup_swarm_draw(count):
+    def setup():
+        screen = make_screen((duck_game.WINDOW_WIDTH, duck_game.WINDOW_HEIGHT))
+        swarm = duck_game.FoodSwarm(count, seed=0)
+        duck_game.prebake_food_sprites()
+        return lambda: swarm.draw(screen)
+    return setup
+
+
+def setup_check_collision(count):
+    def setup():
+        foods = make_duck_foods(count)
+        duck = duck_game.Duck()
+        duck.has_straw = True
+        check_collision = duck_game.check_collision
+        return lambda: [food for food in foods if check_collision(duck, food)]
+    return setup
+
+
+def spaceship_in(state, seconds):
+    # A game animated for a fixed time in state; drawing it does not change it, so every call
+    # of every round draws the same frame
+    random.seed(0)
+    game = spaceship_assembly.SpaceshipGame()
+    game.state = state
+    for _ in range(round(seconds * spaceship_assembly.STEP_RATE)):
+        game.update(1 / spaceship_assembly.STEP_RATE)
+    return game
+
+
+def setup_launch_phase():
+    screen = make_screen((spaceship_assembly.WINDOW_WIDTH, spaceship_assembly.WINDOW_HEIGHT))
+    game = spaceship_in(spaceship_assembly.LAUNCH, 1.0)
+    return lambda: game.draw_launch_phase(screen)
+
+
+def setup_assembly_phase():
+    # Half the parts installed and one on its way
+    screen = make_screen((spaceship_assembly.WINDOW_WIDTH, spaceship_assembly.WINDOW_HEIGHT))
+    game = spaceship_in(spaceship_assembly.ASSEMBLY, 12.0)
+    return lambda: game.draw_assembly_phase(screen)
+
+
+def setup_large_ship():
+    # A ship of 300 parts, every component type in both states, spread over the window
+    screen = make_screen((spaceship_assembly.WINDOW_WIDTH, spaceship_assembly.WINDOW_HEIGHT))
+    random.seed(0)
+    kinds = spaceship_assembly.SpaceshipGame().components
+    parts = []
+    for i in range(300):
+        kind = kinds[i % len(kinds)]
+        position = (random.randint(0, spaceship_assembly.WINDOW_WIDTH), random.randint(0, spaceship_assembly.WINDOW_HEIGHT))
+        part = spaceship_assembly.SpaceshipComponent(kind.name, kind.description, kind.color, kind.size, position)
+        part.is_assembled = i % 2 == 0
+        parts.append(part)
+    return lambda: spaceship_assembly.draw_components(screen, parts)
+
+
+CASES = [
+    ("heart_turtle_draw_1000", setup_turtle_draw()),
+    ("heart_turtle_raster_1000", setup_turtle_draw("raster")),
+    ("curves_explorer_draw_2000", setup_curve_explorer_draw()),
+    ("curves_explorer_raster_2000", setup_curve_explorer_draw("raster")),
+    ("curves_canvas_frame", setup_curve_canvas_frame),
+    ("trail_append_full_1m", setup_trail_append),
+    ("curves_lod_draw_100k", setup_lod_draw()),
+    ("curves_lod_raster_100k", setup_lod_draw("raster")),
+    ("trail_dense_draw_20k", setup_dense_trail_draw("batched")),
+    ("trail_dense_raster_20k", setup_dense_trail_draw("raster")),
+    ("trail_lod_append", setup_lod_append),
+]
+CASES += [(f"duck_food_draw_{count}", setup_food_draw(count)) for count in DUCK_FOOD_COUNTS]
+CASES += [(f"duck_check_collision_{count}", setup_check_collision(count)) for count in DUCK_FOOD_COUNTS]
+CASES += [("duck_swarm_draw_50000", setup_swarm_draw(50000))]
+CASES += [
+    ("spaceship_launch_phase", setup_launch_phase),
+    ("spaceship_assembly_phase", setup_assembly_phase),
+    ("spaceship_large_ship_300", setup_large_ship),
+]
+
+
+def time_case(call, min_time, rounds):
+    # Calibrate the number of calls per round, then report the median over rounds
+    call()
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            call()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / rounds:
+            break
+        calls *= 2
+    per_call = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(calls):
+            call()
+        per_call.append((time.perf_counter() - start) / calls * 1000)
+    return {
+        "median_ms": statistics.median(per_call),
+        "min_ms": min(per_call),
+        "max_ms": max(per_call),
+        "calls_per_round": calls,
+        "rounds": rounds,
+    }
+
+
+def run_suite(name_filter=None, min_time=1.0, rounds=7):
+    pygame.init()
+    results = {}
+    for name, setup in CASES:
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = time_case(setup(), min_time, rounds)
+        print(f"{name:<32} {results[name]['median_ms']:>10.4f} ms")
+    pygame.quit()
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(report, baseline, threshold):
+    # Returns the names of the cases that regressed beyond threshold
+    regressions = []
+    print(f"\n{'case':<32} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, result in report["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:<32} {'-':>10} {result['median_ms']:>10.4f} {'new':>8}")
+            continue
+        change = result["median_ms"] / base["median_ms"] - 1
+        status = "REGRESSED" if change > threshold else ""
+        if status:
+            regressions.append(name)
+        print(f"{name:<32} {base['median_ms']:>10.4f} {result['median_ms']:>10.4f} {change:>+8.1%} {status}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless benchmark suite for the games' hot paths")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="where to write this run's results")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline results to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown of the median before a case fails (0.25 = 25%%)")
+    parser.add_argument("--filter", help="only run cases whose name contains this text")
+    parser.add_argument("--min-time", type=float, default=1.0, help="seconds to spend per case")
+    parser.add_argument("--rounds", type=int, default=7)
+    args = parser.parse_args()
+
+    report = run_suite(args.filter, args.min_time, args.rounds)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline first")
+        return 1
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(report, baseline, args.threshold)
+    if regressions:
+        print(f"\nFAIL: {len(regressions)} case(s) slower than baseline by more than {args.threshold:.0%}: "
+              + ", ".join(regressions))
+        return 1
+    print(f"\nPASS: no case slower than baseline by more than {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+Memoized, vectorized sampling of parametric curves.
+
+A curve function takes a NumPy array of parameter values and a scale and
+returns the x and y arrays. CurveCache samples a whole parameter range in
+one call and keeps the (n, 2) point arrays in an LRU cache keyed by
+(curve, range, step, scale), bounded by total array size. Reset and curve
+switches then reuse the arrays, and an animation only has to index into
+them.
+
+get_adaptive() samples by arc length and curvature instead of a fixed t
+step: consecutive points are about `spacing` pixels apart and the heading
+turns by at most about `angle_tolerance` radians between them, so an
+animation that draws one point per frame moves at a constant on-screen speed.
+"""
+from collections import OrderedDict
+
+import numpy as np
+
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+ADAPTIVE_SPACING = 5.0  # pixels between adaptive samples
+ADAPTIVE_ANGLE = 0.1  # radians the heading may turn between adaptive samples
+DENSE_SAMPLES = 20000  # resolution used to measure arc length and turning
+FALLBACK_STEP = 0.02  # fixed t step for curves with no finite stretch to measure
+
+
+def sample_times(t_range, step):
+    # The t values the old "while t <= end: t += step" loops visited
+    start, end = t_range
+    count = int((end - start) / step + 1e-9) + 1
+    return start + np.arange(count) * step
+
+
+def adaptive_times(func, t_range, scale, spacing=ADAPTIVE_SPACING, angle_tolerance=ADAPTIVE_ANGLE,
+                   dense_samples=DENSE_SAMPLES):
+    # Reparameterize by measure = arc length / spacing + turning / angle_tolerance and
+    # place one sample at every whole unit of measure
+    start, end = t_range
+    t = np.linspace(start, end, dense_samples)
+    x, y = func(t, scale)
+    with np.errstate(invalid="ignore", over="ignore"):
+        dx = np.diff(x)
+        dy = np.diff(y)
+        length = np.hypot(dx, dy)
+        heading = np.arctan2(dy, dx)
+        turn = np.abs((np.diff(heading) + np.pi) % (2 * np.pi) - np.pi)
+    # Where the curve is not finite (e.g. sqrt of a negative number) it has no length and no turn:
+    # those stretches of t get no samples of their own
+    finite = np.isfinite(length)
+    if not finite.any():
+        return sample_times(t_range, FALLBACK_STEP)
+    length = np.where(finite, length, 0.0)
+    turn = np.where(np.isfinite(turn), turn, 0.0)
+    # Cap the turn per dense step: a cusp is one sharp corner, not a pile of points
+    turn = np.minimum(turn / angle_tolerance, 1.0)
+    measure = np.concatenate(([0.0, length[0] / spacing], length[1:] / spacing + turn))
+    measure = np.cumsum(measure)
+    # Always end exactly on the end of the range, at least half a unit after the last sample
+    times = np.interp(np.arange(0.0, measure[-1] - 0.5, 1.0), measure, t)
+    return np.append(times, end)
+
+
+class CurveCache:
+    def __init__(self, max_bytes=MAX_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> points, least recently used first
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, curve, func, t_range, step, scale):
+        # curve names the function in the key: the same name must always mean the same func
+        return self.lookup(self.key(curve, t_range, step, scale),
+                           lambda: func(sample_times(t_range, step), scale))
+
+    def get_adaptive(self, curve, func, t_range, scale, spacing=ADAPTIVE_SPACING, angle_tolerance=ADAPTIVE_ANGLE):
+        return self.lookup(self.adaptive_key(curve, t_range, scale, spacing, angle_tolerance),
+                           lambda: func(adaptive_times(func, t_range, scale, spacing, angle_tolerance), scale))
+
+    def key(self, curve, t_range, step, scale):
+        return (curve, tuple(t_range), step, scale)
+
+    def adaptive_key(self, curve, t_range, scale, spacing=ADAPTIVE_SPACING, angle_tolerance=ADAPTIVE_ANGLE):
+        return (curve, tuple(t_range), ("adaptive", spacing, angle_tolerance), scale)
+
+    def lookup(self, key, sample):
+        points = self.find(key)
+        if points is not None:
+            return points
+        self.misses += 1
+        x, y = sample()
+        return self.put(key, np.column_stack((x, y)))
+
+    def find(self, key):
+        # The cached points for key, or None; never samples
+        points = self.entries.get(key)
+        if points is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+        return points
+
+    def put(self, key, points):
+        # Store points sampled elsewhere (e.g. by a CurvePrefetcher) under key
+        points.flags.writeable = False  # shared between every user of the key
+        replaced = self.entries.pop(key, None)
+        if replaced is not None:
+            self.nbytes -= replaced.nbytes
+        self.entries[key] = points
+        self.nbytes += points.nbytes
+        while self.nbytes > self.max_bytes and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+        return points
+
+    def clear(self):
+        self.entries.clear()
+        self.nbytes = 0
+
+
+# Shared by every scene in the process, so the launcher keeps samples across games
+CURVE_CACHE = CurveCache()
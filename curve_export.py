@@ -0,0 +1,212 @@
+"""
+Headless high-resolution export of the curves, e.g. for printed worksheets.
+
+Renders any curve with its gradient trail to PNG or SVG at any resolution,
+without a display. The curve is fitted to the image and sampled adaptively
+at the export resolution, so lines stay smooth at 8000x8000. The batch mode
+renders a whole catalog across a process pool; a PNG needs width * height * 3
+bytes of memory in each worker.
+
+Usage:
+    python curve_export.py --list
+    python curve_export.py --curve Spiral --size 8000 --output spiral.png
+    python curve_export.py --all --format svg --out-dir exports --curves curves/examples.json
+"""
+import argparse
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from xml.sax.saxutils import escape, quoteattr
+
+import numpy as np
+import pygame
+
+import heart_curve
+import math_curves
+from curve_cache import DENSE_SAMPLES, adaptive_times
+from curve_registry import CurveRegistry
+from trail_render import finite_runs, gradient_bands, split_runs
+
+BACKGROUND = (255, 255, 255)
+START_COLOR = (0, 0, 0)  # oldest end of the trail, as in the explorer
+MARGIN = 0.05  # fraction of the image left empty on each side
+EXPORT_SPACING = 2.0  # pixels between samples at the export resolution
+EXPORT_ANGLE = 0.02  # radians the heading may turn between samples
+
+_catalog = {}  # name -> curve, filled by load_catalog() (the pool initializer in workers)
+
+
+def build_catalog(curve_files=()):
+    # Every exportable curve by name, in the explorer's dict layout plus an optional start_color
+    catalog = {
+        "Heart Curve": {
+            'name': "Heart Curve",
+            'func': heart_curve.heart_curve,
+            'range': heart_curve.HEART_RANGE,
+            'color': heart_curve.RED,
+            'start_color': heart_curve.PINK,
+        },
+    }
+    for curve in math_curves.CurveExplorer().curves.values():
+        catalog[curve['name']] = curve
+    registry = CurveRegistry(catalog)  # a loaded curve may not replace a built-in one
+    for path in curve_files:
+        registry.load(path)
+    for curve in registry:
+        catalog[curve['name']] = curve
+    return catalog
+
+
+def load_catalog(curve_files=()):
+    _catalog.clear()
+    _catalog.update(build_catalog(curve_files))
+
+
+def slug(name):
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_") or "curve"
+
+
+def unique_filenames(names, fmt):
+    # One file per curve even when names share a slug ("Rose 1" and "rose-1"): later ones get _2, _3...
+    taken = set()
+    filenames = []
+    for name in names:
+        base = slug(name)
+        filename = f"{base}.{fmt}"
+        number = 1
+        while filename in taken:
+            number += 1
+            filename = f"{base}_{number}.{fmt}"
+        taken.add(filename)
+        filenames.append(filename)
+    return filenames
+
+
+def finite_bounds(x, y):
+    # (low, high) corners of the points whose coordinates are both finite
+    finite = np.isfinite(x) & np.isfinite(y)
+    if not finite.any():
+        raise ValueError("curve has no finite points")
+    x, y = x[finite], y[finite]
+    return np.array((x.min(), y.min())), np.array((x.max(), y.max()))
+
+
+def fit_points(curve, size, margin=MARGIN):
+    # Sample the curve finely enough for size and scale/center it into the image
+    width, height = size
+    func, t_range = curve['func'], curve['range']
+    # Points that are not finite (undefined or infinite) are left out of the fit and break the drawn line
+    x, y = func(np.linspace(*t_range, DENSE_SAMPLES), 1.0)
+    low, high = finite_bounds(x, y)
+    span_x = float(high[0] - low[0]) or 1.0
+    span_y = float(high[1] - low[1]) or 1.0
+    scale = min(width * (1 - 2 * margin) / span_x, height * (1 - 2 * margin) / span_y)
+
+    dense_samples = max(DENSE_SAMPLES, 8 * max(size))
+    t = adaptive_times(func, t_range, scale, EXPORT_SPACING, EXPORT_ANGLE, dense_samples)
+    x, y = func(t, scale)
+    # Some curve functions add a fixed screen offset, so center on the scaled points
+    low, high = finite_bounds(x, y)
+    x = x - (low[0] + high[0]) / 2 + width / 2
+    y = y - (low[1] + high[1]) / 2 + height / 2
+    return np.column_stack((x, y))
+
+
+def line_width(size):
+    return max(1, round(min(size) / 400))
+
+
+def export_png(curve, path, size):
+    points = fit_points(curve, size)
+    runs = finite_runs(points)
+    points = points.tolist()
+    surface = pygame.Surface(size, depth=24)
+    surface.fill(BACKGROUND)
+    width = line_width(size)
+    start_color = curve.get('start_color', START_COLOR)
+    for first, last, color in gradient_bands(len(points), start_color, curve['color']):
+        for start, end in split_runs(runs, first, last):
+            pygame.draw.lines(surface, color, False, points[start:end + 1], width)
+    pygame.image.save(surface, path)
+
+
+def export_svg(curve, path, size):
+    points = fit_points(curve, size)
+    runs = finite_runs(points)
+    width, height = size
+    stroke = line_width(size)
+    start_color = curve.get('start_color', START_COLOR)
+    lines = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}">',
+        f"<title>{escape(curve['name'])}</title>",
+        f'<rect width="100%" height="100%" fill={quoteattr(f"rgb{tuple(BACKGROUND)}")}/>',
+    ]
+    for first, last, color in gradient_bands(len(points), start_color, curve['color']):
+        for start, end in split_runs(runs, first, last):
+            coords = " ".join(f"{x:.2f},{y:.2f}" for x, y in points[start:end + 1])
+            lines.append(f'<polyline fill="none" stroke={quoteattr(f"rgb{tuple(color)}")} stroke-width="{stroke}" '
+                         f'stroke-linecap="round" stroke-linejoin="round" points="{coords}"/>')
+    lines.append("</svg>")
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def export_curve(curve, path, size):
+    if path.lower().endswith(".svg"):
+        export_svg(curve, path, size)
+    else:
+        export_png(curve, path, size)
+    return path
+
+
+def export_named(name, path, size):
+    # Runs in the workers: curves hold compiled functions, so only names cross processes
+    return export_curve(_catalog[name], path, size)
+
+
+def export_batch(names, out_dir, size, fmt="png", curve_files=(), workers=None):
+    os.makedirs(out_dir, exist_ok=True)
+    paths = [os.path.join(out_dir, filename) for filename in unique_filenames(names, fmt)]
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=load_catalog,
+                             initargs=(tuple(curve_files),)) as pool:
+        return list(pool.map(export_named, names, paths, repeat(size)))
+
+
+def parse_size(text):
+    width, _, height = text.lower().partition("x")
+    return int(width), int(height or width)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export curves to PNG or SVG without a display")
+    parser.add_argument("--curves", nargs="+", default=[], metavar="PATH", help="extra curve files to load")
+    parser.add_argument("--list", action="store_true", help="list the available curves")
+    parser.add_argument("--curve", help="name of the curve to export")
+    parser.add_argument("--output", help="output file for --curve (.png or .svg)")
+    parser.add_argument("--all", action="store_true", help="export every curve in the catalog")
+    parser.add_argument("--out-dir", default="exports", help="output directory for --all")
+    parser.add_argument("--format", choices=["png", "svg"], default="png", help="file format for --all")
+    parser.add_argument("--size", type=parse_size, default=(2000, 2000), help="WIDTHxHEIGHT or one number")
+    parser.add_argument("--workers", type=int, help="worker processes for --all (default: all cores)")
+    args = parser.parse_args()
+
+    load_catalog(args.curves)
+    if args.list:
+        for name in _catalog:
+            print(name)
+    elif args.all:
+        start = time.perf_counter()
+        paths = export_batch(list(_catalog), args.out_dir, args.size, args.format, args.curves, args.workers)
+        print(f"Exported {len(paths)} curves to {args.out_dir} in {time.perf_counter() - start:.1f}s")
+    elif args.curve:
+        if args.curve not in _catalog:
+            parser.error(f"unknown curve {args.curve!r}; see --list")
+        path = args.output or f"{slug(args.curve)}.png"
+        export_curve(_catalog[args.curve], path, args.size)
+        print(f"Exported {args.curve} to {path}")
+    else:
+        parser.error("use --list, --curve NAME or --all")
@@ -0,0 +1,118 @@
+"""
+Background curve sampling for the render loop.
+
+A CurvePrefetcher evaluates one curve on a worker thread, a chunk of t
+values at a time, and hands the chunks to the render loop through a bounded
+queue. The render loop only polls: it never waits for a chunk. It copies
+whatever is ready into one preallocated array and animates as far as that
+array reaches, so its frame time stays flat however heavy the curve is.
+start() bumps a generation counter and starts a fresh worker, and a worker
+stops as soon as it sees that its generation is no longer current. A curve
+switch therefore restarts sampling at once, and results left over from the
+old curve are never mixed in. An exception in the worker is never raised
+in the render loop: poll() stores it in `error` for the owner to handle.
+
+A thread rather than a process: user-defined kernels are closures that
+cannot be pickled, and NumPy releases the GIL for most of the work.
+"""
+import queue
+import threading
+
+import numpy as np
+
+PREFETCH_CHUNK = 512  # t values evaluated per chunk
+PREFETCH_DEPTH = 8  # chunks the worker may get ahead of the render loop
+PUT_TIMEOUT = 0.05  # seconds a blocked worker waits before checking whether it is still current
+
+
+class CurvePrefetcher:
+    def __init__(self, chunk=PREFETCH_CHUNK, depth=PREFETCH_DEPTH):
+        self.chunk = chunk
+        self.depth = depth
+        self.generation = 0
+        self.lock = threading.Lock()  # guards generation against the workers
+        self.key = None
+        self.reset_state()
+
+    def reset_state(self):
+        self.queue = None
+        self.data = None  # (count, 2) array, allocated once the worker knows the count
+        self.ready = 0  # points of data filled in so far
+        self.done = False
+        self.error = None  # exception raised by the worker; the job stops there
+
+    def start(self, key, times, func, scale):
+        # Sample func(times(), scale) in the background; key identifies the job (e.g. its cache key)
+        with self.lock:
+            self.generation += 1
+            generation = self.generation
+        self.reset_state()
+        self.key = key
+        self.queue = queue.Queue(self.depth)
+        worker = threading.Thread(target=self.work, args=(generation, self.queue, times, func, scale),
+                                  name="curve-prefetch", daemon=True)
+        worker.start()
+
+    def stop(self):
+        # Abandon the current job; its worker exits at its next chunk
+        with self.lock:
+            self.generation += 1
+        self.reset_state()
+        self.key = None
+
+    def current(self, generation):
+        with self.lock:
+            return generation == self.generation
+
+    def work(self, generation, results, times, func, scale):
+        def send(item):
+            # Wait for room in the queue, but give up as soon as the job is superseded
+            while self.current(generation):
+                try:
+                    results.put(item, timeout=PUT_TIMEOUT)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        try:
+            t = times()
+            if not send(("count", len(t))):
+                return
+            for first in range(0, len(t), self.chunk):
+                x, y = func(t[first:first + self.chunk], scale)
+                if not send(("points", np.column_stack((x, y)))):
+                    return
+        except Exception as error:
+            send(("error", error))
+            return
+        send(("done", None))
+
+    def poll(self):
+        # Take every chunk that is ready, without blocking; returns the points ready so far
+        while self.queue is not None and not self.done and self.error is None:
+            try:
+                kind, value = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "count":
+                self.data = np.empty((value, 2))
+            elif kind == "points":
+                self.data[self.ready:self.ready + len(value)] = value
+                self.ready += len(value)
+            elif kind == "error":
+                with self.lock:
+                    self.generation += 1
+                self.error = value
+            else:
+                self.done = True
+        return self.points()
+
+    def points(self):
+        if self.data is None:
+            return np.empty((0, 2))
+        return self.data[:self.ready]
+
+    def count(self):
+        # Total points of the current job, or None until the worker has computed its t values
+        return None if self.data is None else len(self.data)
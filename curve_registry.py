@@ -0,0 +1,236 @@
+"""
+Registry of user-defined parametric curves.
+
+Curves are written as expressions in t, e.g. ``x = sin(3t), y = sin(2t)``.
+Implicit multiplication (``3t``, ``2sin(t)``, ``(t)(t)``, ``pi t``) and ``^``
+for powers are accepted; numbers may use exponents (``1e-3``). Expressions are
+parsed with ast and only arithmetic, numbers, t, pi/e/tau and a fixed set of
+NumPy functions are allowed, so a curve file cannot run arbitrary code. Each
+x/y pair is compiled once into a vectorized kernel
+``kernel(t, scale) -> (x, y)``, cached by the hash of the normalized
+expressions, so it evaluates like the built-in curves. Every number is a
+NumPy float64, so overflow and division by zero give inf or nan instead of
+raising. A curve is evaluated once when it is added: one that fails or has
+no finite point is rejected, and the non-finite points of the others are
+left out of the drawing (the trail breaks there).
+
+Curve files are JSON, either a list of curves or {"curves": [...]}:
+
+    {"name": "Cardioid", "x": "(1 - cos(t)) cos(t)", "y": "(1 - cos(t)) sin(t)",
+     "range": [0, "2pi"], "scale": 120, "color": [200, 0, 120]}
+
+"spec": "x = ..., y = ..." can replace "x" and "y"; range, scale and color
+are optional. See curves/examples.json.
+"""
+import ast
+import hashlib
+import json
+import math
+import re
+
+import numpy as np
+
+FUNCTIONS = {
+    "sin": np.sin, "cos": np.cos, "tan": np.tan,
+    "asin": np.arcsin, "acos": np.arccos, "atan": np.arctan,
+    "sinh": np.sinh, "cosh": np.cosh, "tanh": np.tanh,
+    "exp": np.exp, "log": np.log, "sqrt": np.sqrt,
+    "abs": np.abs, "sign": np.sign, "floor": np.floor, "ceil": np.ceil,
+}
+CONSTANTS = {"pi": np.float64(math.pi), "e": np.float64(math.e), "tau": np.float64(math.tau)}
+VARIABLE = "t"
+FLOAT = "float64"  # every number literal is wrapped in a call to this
+ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod, ast.USub, ast.UAdd,
+)
+
+DEFAULT_RANGE = (0, 2 * math.pi)
+DEFAULT_SCALE = 100
+TRIAL_SAMPLES = 256  # t values a curve is checked with when it is added
+PALETTE = [(255, 0, 0), (128, 0, 128), (0, 0, 255), (0, 160, 0), (255, 165, 0), (0, 160, 160), (200, 0, 120)]
+
+# Numbers are matched first, so the e of 1e-3 is part of the number and not the constant e
+TOKEN = re.compile(r"\s*(?:(?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)|(?P<name>[A-Za-z_]\w*)|(?P<other>\S))")
+SPEC = re.compile(r"^\s*x\s*=\s*(?P<x>.+?)\s*[,;]\s*y\s*=\s*(?P<y>.+?)\s*$")
+
+_kernels = {}  # expression hash -> compiled kernel, shared by every registry
+
+
+def normalize(source):
+    # Two operands in a row are a multiplication: 3t, 2sin(t), (t)(t), (t)2, 2 3, pi t, t(t + 1).
+    # A function name is not an operand: it must be followed by its "(" and nothing is inserted
+    tokens = []
+    previous = None
+    for match in TOKEN.finditer(source.rstrip()):
+        kind = match.lastgroup
+        text = match[kind]
+        if previous == "function" and text != "(":
+            raise ValueError(f"Invalid expression {source!r}: {tokens[-1]} must be followed by (")
+        if previous in ("number", "name", ")") and (kind in ("number", "name") or text == "("):
+            tokens.append("*")
+        tokens.append("**" if text == "^" else text)
+        if kind == "other":
+            previous = text
+        else:
+            previous = "function" if text in FUNCTIONS else kind
+    return "".join(tokens)
+
+
+def parse_expression(source, allow_variable=True):
+    # Parse and validate one expression; returns its ast with every number as a float
+    try:
+        tree = ast.parse(normalize(source), mode="eval")
+    except SyntaxError as error:
+        raise ValueError(f"Invalid expression {source!r}: {error.msg}") from None
+
+    called = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, ALLOWED_NODES):
+            raise ValueError(f"Invalid expression {source!r}: {type(node).__name__} is not allowed")
+        if isinstance(node, ast.Call):
+            if not (isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS):
+                raise ValueError(f"Invalid expression {source!r}: only {', '.join(FUNCTIONS)} can be called")
+            if len(node.args) != 1 or node.keywords:
+                raise ValueError(f"Invalid expression {source!r}: {node.func.id}() takes one argument")
+            called.add(id(node.func))
+        elif isinstance(node, ast.Name):
+            if node.id in FUNCTIONS and id(node) in called:
+                continue
+            if node.id not in CONSTANTS and not (allow_variable and node.id == VARIABLE):
+                raise ValueError(f"Invalid expression {source!r}: unknown name {node.id!r}")
+        elif isinstance(node, ast.Constant):
+            if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+                raise ValueError(f"Invalid expression {source!r}: only numbers are allowed")
+    return ast.fix_missing_locations(FloatLiterals().visit(tree))
+
+
+class FloatLiterals(ast.NodeTransformer):
+    # 9^9^9 and pi/0 must give inf/nan like the rest of the NumPy arithmetic instead of raising
+    # OverflowError or ZeroDivisionError (or building a huge integer)
+    def visit_Constant(self, node):
+        return ast.Call(ast.Name(FLOAT, ast.Load()), [ast.Constant(float(node.value))], [])
+
+
+def evaluate(code, variables):
+    with np.errstate(all="ignore"):
+        return eval(code, {"__builtins__": {}, FLOAT: np.float64, **FUNCTIONS, **CONSTANTS, **variables})
+
+
+def evaluate_constant(value):
+    # Range bounds may be numbers or constant expressions such as "2pi"
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if not isinstance(value, str):
+        raise ValueError(f"Expected a number or an expression, got {value!r}")
+    code = compile(parse_expression(value, allow_variable=False), "<curve constant>", "eval")
+    result = float(evaluate(code, {}))
+    if not math.isfinite(result):
+        raise ValueError(f"{value!r} is not a finite number")
+    return result
+
+
+def expression_key(x_source, y_source):
+    return hashlib.sha1(f"{normalize(x_source)};{normalize(y_source)}".encode()).hexdigest()
+
+
+def compile_kernel(x_source, y_source):
+    # Compiled once per distinct (x, y) pair; returns kernel(t, scale) -> (x, y)
+    key = expression_key(x_source, y_source)
+    kernel = _kernels.get(key)
+    if kernel is not None:
+        return kernel
+
+    x_code = compile(parse_expression(x_source), "<curve x>", "eval")
+    y_code = compile(parse_expression(y_source), "<curve y>", "eval")
+
+    def kernel(t, scale):
+        variables = {VARIABLE: t}
+        # Expressions that do not use t evaluate to a number: spread it over every t
+        x = np.broadcast_to(evaluate(x_code, variables), np.shape(t))
+        y = np.broadcast_to(evaluate(y_code, variables), np.shape(t))
+        with np.errstate(all="ignore"):
+            return x * scale, y * scale
+
+    kernel.key = key
+    _kernels[key] = kernel
+    return kernel
+
+
+def parse_color(value):
+    if isinstance(value, str) and re.fullmatch(r"#[0-9a-fA-F]{6}", value):
+        return tuple(int(value[i:i + 2], 16) for i in (1, 3, 5))
+    if isinstance(value, (list, tuple)) and len(value) == 3 and all(
+            isinstance(c, int) and 0 <= c <= 255 for c in value):
+        return tuple(value)
+    raise ValueError(f"Invalid color {value!r}: use [r, g, b] or \"#rrggbb\"")
+
+
+def check_kernel(name, func, t_range):
+    # Evaluate a new curve once, so a broken one fails when it is loaded and not mid-animation
+    try:
+        x, y = func(np.linspace(*t_range, TRIAL_SAMPLES), 1.0)
+    except Exception as error:
+        raise ValueError(f"Curve {name!r} cannot be evaluated: {error}") from None
+    if not np.any(np.isfinite(x) & np.isfinite(y)):
+        raise ValueError(f"Curve {name!r} has no finite points in its range")
+
+
+class CurveRegistry:
+    def __init__(self, reserved_names=()):
+        # reserved_names: names already taken, e.g. by built-in curves; a curve may not reuse them
+        self.reserved_names = set(reserved_names)
+        self.curves = []
+
+    def __len__(self):
+        return len(self.curves)
+
+    def __iter__(self):
+        return iter(self.curves)
+
+    def add(self, name, x, y, t_range=DEFAULT_RANGE, scale=DEFAULT_SCALE, color=None):
+        # Returns the curve in the same dict layout as CurveExplorer's built-in curves
+        if name in self.reserved_names or any(curve['name'] == name for curve in self.curves):
+            raise ValueError(f"Curve {name!r}: a curve with that name already exists")
+        start, end = (evaluate_constant(bound) for bound in t_range)
+        if not end > start:
+            raise ValueError(f"Curve {name!r}: range end must be greater than its start")
+        func = compile_kernel(x, y)
+        check_kernel(name, func, (start, end))
+        curve = {
+            'name': name,
+            'key': f"expr:{func.key}",  # cache key: curves with the same expressions share samples
+            'func': func,
+            'range': (start, end),
+            'scale': float(scale),
+            'color': PALETTE[len(self.curves) % len(PALETTE)] if color is None else parse_color(color),
+            'equation': f"x = {x}, y = {y}",
+        }
+        self.curves.append(curve)
+        return curve
+
+    def add_spec(self, name, spec, **metadata):
+        match = SPEC.match(spec)
+        if not match:
+            raise ValueError(f"Curve {name!r}: expected \"x = ..., y = ...\", got {spec!r}")
+        return self.add(name, match["x"], match["y"], **metadata)
+
+    def load(self, path):
+        # Add every curve in a JSON file; returns how many were added
+        with open(path) as f:
+            data = json.load(f)
+        entries = data["curves"] if isinstance(data, dict) else data
+        added = 0
+        for i, entry in enumerate(entries):
+            name = entry.get("name", f"{path}[{i}]")
+            metadata = {"t_range": entry["range"]} if "range" in entry else {}
+            metadata.update({field: entry[field] for field in ("scale", "color") if field in entry})
+            try:
+                if "spec" in entry:
+                    self.add_spec(name, entry["spec"], **metadata)
+                else:
+                    self.add(name, entry["x"], entry["y"], **metadata)
+            except KeyError as error:
+                raise ValueError(f"{path}: curve {name!r} is missing {error}") from None
+            added += 1
+        return added
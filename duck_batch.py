@@ -0,0 +1,179 @@
+import argparse
+import ast
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+# 只导入游戏逻辑，不初始化Pygame、不打开窗口，工作进程启动很快
+import duck_game
+from duck_game import DT, NO_INPUT, Inputs, run_headless
+
+# 机器人策略：用种子创建，每一步根据游戏状态返回按键
+class IdleBot:
+    # 一动不动，作为基准
+    def __init__(self, seed):
+        pass
+
+    def __call__(self, state):
+        return NO_INPUT
+
+class RandomBot:
+    # 随机选一个方向按住0.5到2秒
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.inputs = NO_INPUT
+        self.hold_ticks = 0
+
+    def __call__(self, state):
+        if self.hold_ticks <= 0:
+            self.inputs = Inputs(*(self.rng.random() < 0.3 for _ in range(4)))
+            self.hold_ticks = self.rng.randint(int(0.5 / DT), int(2 / DT))
+        self.hold_ticks -= 1
+        return self.inputs
+
+class GreedyBot:
+    # 一直朝最近的食物游过去
+    def __init__(self, seed):
+        pass
+
+    def __call__(self, state):
+        duck = state.duck
+        target = state.foods.nearest(duck.x, duck.y)
+        if target is None:
+            return NO_INPUT
+        dx = target[0] - duck.x
+        dy = target[1] - duck.y
+        dead_zone = duck.speed * DT  # 离目标不到一步时不再按键，避免来回抖动
+        return Inputs(dx < -dead_zone, dx > dead_zone, dy < -dead_zone, dy > dead_zone)
+
+POLICIES = {
+    "idle": IdleBot,
+    "random": RandomBot,
+    "greedy": GreedyBot,
+}
+
+# 可以用--set覆盖的调参常量：只有运行时才读取的才有效。TICK_RATE、DT、GRID_CELL_SIZE等在导入时
+# 就被算进了其他常量或默认参数，覆盖了也只会让游戏时间和速度对不上，所以不允许
+TUNABLE_CONSTANTS = (
+    "STRAW_LENGTH", "STRAW_WIDTH", "STRAW_SCORE",
+    "MILESTONE_POINTS", "MILESTONE_GROWTH",
+    "FOOD_SIZE", "FOOD_BASE_SPEED", "FOOD_SPEED_STEP",
+)
+
+def check_overrides(overrides):
+    for name, value in overrides.items():
+        if name not in TUNABLE_CONSTANTS:
+            raise ValueError(f"Cannot override {name}; tunable constants: {', '.join(TUNABLE_CONSTANTS)}")
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"{name} must be a number, got {value!r}")
+
+def apply_overrides(overrides):
+    # 在工作进程里覆盖duck_game的调参常量，例如 {"STRAW_LENGTH": 120}
+    check_overrides(overrides)
+    for name, value in overrides.items():
+        setattr(duck_game, name, value)
+
+def run_game(seed, policy, seconds, food_count, swarm):
+    # 在工作进程里跑一局无界面游戏，返回可以跨进程传递的结果
+    bot = POLICIES[policy](seed) if isinstance(policy, str) else policy(seed)
+    state = run_headless(seconds, bot, food_count, swarm, seed)
+    return {
+        "seed": seed,
+        "score": state.score,
+        "milestone_times": {points: tick * DT for points, tick in state.milestone_ticks.items()},
+        "straw_time": None if state.straw_tick is None else state.straw_tick * DT,
+    }
+
+def summarize_times(times, games):
+    return {
+        "reached": len(times),
+        "reached_ratio": len(times) / games,
+        "mean": statistics.fmean(times) if times else None,
+        "median": statistics.median(times) if times else None,
+    }
+
+def summarize(results):
+    # 汇总分数和到达每个里程碑所用的时间（秒）
+    scores = [result["score"] for result in results]
+    games = len(results)
+    milestones = sorted({points for result in results for points in result["milestone_times"]})
+    return {
+        "games": games,
+        "score": {
+            "mean": statistics.fmean(scores),
+            "stdev": statistics.pstdev(scores),
+            "min": min(scores),
+            "median": statistics.median(scores),
+            "max": max(scores),
+        },
+        "milestones": {
+            points: summarize_times([result["milestone_times"][points] for result in results
+                                     if points in result["milestone_times"]], games)
+            for points in milestones
+        },
+        "straw": summarize_times([result["straw_time"] for result in results
+                                  if result["straw_time"] is not None], games),
+    }
+
+def run_batch(games, policy="greedy", seconds=300, food_count=5, swarm=False, base_seed=0,
+              workers=None, overrides=None):
+    # 把games局种子为base_seed, base_seed+1, ...的游戏分到所有CPU核心上跑
+    # policy可以是POLICIES里的名字，也可以是模块顶层定义的机器人类（工作进程要能导入）
+    if isinstance(policy, str) and policy not in POLICIES:
+        raise ValueError(f"Unknown policy: {policy}")
+    check_overrides(overrides or {})  # 无效的覆盖在启动进程池之前就报错
+    workers = workers or os.cpu_count() or 1
+    seeds = range(base_seed, base_seed + games)
+    chunksize = max(1, games // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=apply_overrides,
+                             initargs=(overrides or {},)) as pool:
+        results = list(pool.map(run_game, seeds, repeat(policy), repeat(seconds),
+                                repeat(food_count), repeat(swarm), chunksize=chunksize))
+    return summarize(results)
+
+def format_time(seconds):
+    return "-" if seconds is None else f"{seconds:.1f}s"
+
+def print_summary(summary, max_milestones=10):
+    score = summary["score"]
+    print(f"Games: {summary['games']}")
+    print(f"Score: mean {score['mean']:.1f}, stdev {score['stdev']:.1f}, "
+          f"min {score['min']}, median {score['median']}, max {score['max']}")
+    print(f"{'milestone':>10} {'reached':>9} {'mean time':>10} {'median time':>12}")
+    rows = list(summary["milestones"].items())[:max_milestones]
+    rows.append(("straw", summary["straw"]))
+    for points, times in rows:
+        print(f"{points:>10} {times['reached_ratio']:>8.0%} {format_time(times['mean']):>10} "
+              f"{format_time(times['median']):>12}")
+
+def parse_override(text):
+    name, _, value = text.partition("=")
+    return name.strip(), ast.literal_eval(value.strip())
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run many seeded headless duck games in parallel")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="greedy")
+    parser.add_argument("--seconds", type=float, default=300, help="simulated seconds per game")
+    parser.add_argument("--foods", type=int, default=5)
+    parser.add_argument("--swarm", action="store_true")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--set", dest="overrides", type=parse_override, action="append", default=[],
+                        metavar="NAME=VALUE", help="override a tuning constant, e.g. STRAW_LENGTH=120 "
+                             f"(one of {', '.join(TUNABLE_CONSTANTS)})")
+    args = parser.parse_args()
+    try:
+        check_overrides(dict(args.overrides))
+    except ValueError as error:
+        parser.error(str(error))
+
+    start = time.perf_counter()
+    summary = run_batch(args.games, args.policy, args.seconds, args.foods, args.swarm, args.seed,
+                        args.workers, dict(args.overrides))
+    elapsed = time.perf_counter() - start
+    print_summary(summary)
+    print(f"Simulated {args.games * args.seconds:.0f} game seconds in {elapsed:.2f}s")
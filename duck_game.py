@@ -1,15 +1,18 @@
+import argparse
+import collections
+import numpy as np
 import pygame
 import random
+import struct
 import sys
+import time
+import zlib
+from frame_profiler import NULL_PROFILER
+from game_runtime import GameRuntime, Scene
 
-# 初始化Pygame
-pygame.init()
-
-# 设置游戏窗口
+# 游戏窗口尺寸（Pygame和窗口在main()里通过GameRuntime初始化，无界面模式完全不碰显示和声音）
 WINDOW_WIDTH = 1600
 WINDOW_HEIGHT = 900
-screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-pygame.display.set_caption("Duck Collection Game")
 
 # 颜色定义
 WHITE = (255, 255, 255)
@@ -20,62 +23,97 @@ GREEN = (0, 255, 0)
 RED = (255, 0, 0)
 BLACK = (0, 0, 0)
 
-# 游戏时钟
-clock = pygame.time.Clock()
+# 食物与吸管尺寸
+FOOD_SIZE = 20
+STRAW_LENGTH = 80
+STRAW_WIDTH = 8
 
-# 音效系统
-sounds_enabled = True
-try:
-    pygame.mixer.init()
-    # 预留音效加载位置
-    collect_sound = None
-    background_music = None
-    
-    # 尝试加载音效文件
-    try:
-        # collect_sound = pygame.mixer.Sound("sounds/collect.wav")
-        # collect_sound.set_volume(0.5)
-        pass
-    except:
-        print("Warning: Could not load collect sound")
-    
-    # 尝试加载背景音乐
-    try:
-        # pygame.mixer.music.load("sounds/background.mp3")
-        # pygame.mixer.music.set_volume(0.3)
-        # pygame.mixer.music.play(-1)  # -1 表示循环播放
-        pass
-    except:
-        print("Warning: Could not load background music")
-except:
-    sounds_enabled = False
-    print("Warning: Sound system could not be initialized")
+# 食物速度：FOOD_BASE_SPEED + (分数 - 1) * FOOD_SPEED_STEP（像素/步）
+FOOD_BASE_SPEED = 1
+FOOD_SPEED_STEP = 0.3
+
+# 每MILESTONE_POINTS分一个里程碑，鸭子长大MILESTONE_GROWTH；STRAW_SCORE分获得吸管
+MILESTONE_POINTS = 100
+MILESTONE_GROWTH = 0.1
+STRAW_SCORE = 500
+
+# 空间网格格子边长（像素），略大于食物直径
+GRID_CELL_SIZE = 64
+
+# 每帧脏矩形超过这个数量时改为整屏刷新
+MAX_DIRTY_RECTS = 256
+
+# 食物群遮挡剔除：食物总面积超过屏幕面积的FOOD_CULL_OVERDRAW倍时，
+# 在FOOD_CULL_CELL像素的格子上找出被后画的食物完全盖住的食物，不再绘制
+FOOD_CULL_CELL = 4
+FOOD_CULL_OVERDRAW = 8
+
+# 固定步长模拟：每秒60个逻辑步，与渲染帧率无关
+TICK_RATE = 60
+DT = 1.0 / TICK_RATE
+MAX_FRAME_TIME = 0.25  # 单帧最多补算的时间，防止卡顿后越积越多
+FPS = 60
+
+# 里程碑消息显示时间（秒）和闪烁周期
+MILESTONE_DISPLAY_TIME = 3.0
+MILESTONE_BLINK_PERIOD = 1 / 3
+MILESTONE_BLINK_ON = 0.25
+
+# 一个逻辑步的按键输入
+Inputs = collections.namedtuple("Inputs", ["left", "right", "up", "down"])
+NO_INPUT = Inputs(False, False, False, False)
+
+def inputs_from_keys(keys):
+    return Inputs(keys[pygame.K_LEFT], keys[pygame.K_RIGHT], keys[pygame.K_UP], keys[pygame.K_DOWN])
+
+def pack_inputs(inputs):
+    # 四个方向键压缩成一个字节的低4位
+    return inputs.left | inputs.right << 1 | inputs.up << 2 | inputs.down << 3
+
+def unpack_inputs(byte):
+    return Inputs(bool(byte & 1), bool(byte & 2), bool(byte & 4), bool(byte & 8))
+
+# 录像文件：文件头（魔数、版本、随机种子、食物数量、是否食物群、步数、
+# 最终分数、鸭子最终x/y/尺寸/吸管）+ zlib压缩的每步按键字节
+REPLAY_MAGIC = b"DUCK"
+REPLAY_VERSION = 1
+REPLAY_HEADER = struct.Struct("<4sBQIBIqddiB")
+SEED_LIMIT = 2 ** 64  # 种子在录像头里是64位无符号整数，也是NumPy随机数生成器能接受的范围
+FOOD_COUNT_LIMIT = 2 ** 32  # 食物数量在录像头里是32位无符号整数
 
 class Duck:
     def __init__(self):
         self.x = WINDOW_WIDTH // 2
         self.y = WINDOW_HEIGHT // 2
+        self.prev_x = self.x  # 上一步的位置，用于渲染插值
+        self.prev_y = self.y
         self.base_size = 45  # 基础鸭子尺寸
         self.size = 45  # 当前鸭子尺寸
-        self.speed = 5
+        self.speed = 300  # 像素/秒
         self.has_straw = False  # 是否有吸管
     
-    def move(self, keys):
-        if keys[pygame.K_LEFT] and self.x > self.size:
-            self.x -= self.speed
-        if keys[pygame.K_RIGHT] and self.x < WINDOW_WIDTH - self.size:
-            self.x += self.speed
-        if keys[pygame.K_UP] and self.y > self.size:
-            self.y -= self.speed
-        if keys[pygame.K_DOWN] and self.y < WINDOW_HEIGHT - self.size:
-            self.y += self.speed
+    def move(self, inputs, dt=DT):
+        self.prev_x = self.x
+        self.prev_y = self.y
+        step = self.speed * dt
+        if inputs.left and self.x > self.size:
+            self.x -= step
+        if inputs.right and self.x < WINDOW_WIDTH - self.size:
+            self.x += step
+        if inputs.up and self.y > self.size:
+            self.y -= step
+        if inputs.down and self.y < WINDOW_HEIGHT - self.size:
+            self.y += step
     
-    def draw(self, screen):
-        # 画小鸭子身体
-        pygame.draw.circle(screen, YELLOW, (self.x, self.y), self.size)
+    def draw(self, screen, alpha=1.0):
+        # 在上一步和当前位置之间插值绘制
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        y = self.prev_y + (self.y - self.prev_y) * alpha
+        # 画小鸭子身体（返回鸭子占用的矩形，供脏矩形刷新使用）
+        rect = pygame.draw.circle(screen, YELLOW, (x, y), self.size)
         # 画小鸭子嘴巴
-        beak_x = int(self.x + self.size * 0.67)
-        beak_y = int(self.y - self.size * 0.18)
+        beak_x = int(x + self.size * 0.67)
+        beak_y = int(y - self.size * 0.18)
         beak_size = int(self.size * 0.27)
         pygame.draw.circle(screen, ORANGE, (beak_x, beak_y), beak_size)
         # 画小鸭子眼睛
@@ -83,13 +121,13 @@ class Duck:
         eye_offset_y1 = int(self.size * 0.33)
         eye_offset_y2 = int(self.size * 0.18)
         eye_size = int(self.size * 0.11)
-        pygame.draw.circle(screen, BLACK, (self.x + eye_offset_x, self.y - eye_offset_y1), eye_size)
-        pygame.draw.circle(screen, BLACK, (self.x + eye_offset_x, self.y + eye_offset_y2), eye_size)
+        pygame.draw.circle(screen, BLACK, (x + eye_offset_x, y - eye_offset_y1), eye_size)
+        pygame.draw.circle(screen, BLACK, (x + eye_offset_x, y + eye_offset_y2), eye_size)
         
         # 画吸管（如果有）
         if self.has_straw:
-            straw_length = 80
-            straw_width = 8
+            straw_length = STRAW_LENGTH
+            straw_width = STRAW_WIDTH
             # 吸管起点（嘴巴位置）
             straw_start_x = beak_x + beak_size
             straw_start_y = beak_y
@@ -97,26 +135,32 @@ class Duck:
             straw_end_x = straw_start_x + straw_length
             straw_end_y = straw_start_y
             # 画吸管
-            pygame.draw.line(screen, (150, 75, 0), (straw_start_x, straw_start_y), 
-                            (straw_end_x, straw_end_y), straw_width)
+            rect.union_ip(pygame.draw.line(screen, (150, 75, 0), (straw_start_x, straw_start_y), 
+                                           (straw_end_x, straw_end_y), straw_width))
             # 画吸管末端
-            pygame.draw.circle(screen, (150, 75, 0), (straw_end_x, straw_end_y), straw_width // 2)
+            rect.union_ip(pygame.draw.circle(screen, (150, 75, 0), (straw_end_x, straw_end_y), straw_width // 2))
+        
+        return rect
 
 class Food:
-    def __init__(self):
-        self.x = random.randint(40, WINDOW_WIDTH - 40)
-        self.y = random.randint(40, WINDOW_HEIGHT - 40)
-        self.size = 20  # 增大豆子大小
-        self.score = random.randint(1, 10)  # 随机分数1-10
+    def __init__(self, rng=random):
+        self.x = rng.randint(40, WINDOW_WIDTH - 40)
+        self.y = rng.randint(40, WINDOW_HEIGHT - 40)
+        self.prev_x = self.x
+        self.prev_y = self.y
+        self.size = FOOD_SIZE  # 增大豆子大小
+        self.score = rng.randint(1, 10)  # 随机分数1-10
         # 速度根据分数设定：分数越高速度越快
-        base_speed = 1 + (self.score - 1) * 0.3  # 速度范围: 1.0 到 3.7
-        self.vx = random.choice([-1, 1]) * base_speed
-        self.vy = random.choice([-1, 1]) * base_speed
+        base_speed = food_speed(self.score)
+        self.vx = rng.choice([-1, 1]) * base_speed
+        self.vy = rng.choice([-1, 1]) * base_speed
     
-    def update(self):
+    def update(self, dt=DT):
         # 更新位置
-        self.x += self.vx
-        self.y += self.vy
+        self.prev_x = self.x
+        self.prev_y = self.y
+        self.x += self.vx * dt
+        self.y += self.vy * dt
         
         # 碰到边界反弹
         if self.x <= self.size or self.x >= WINDOW_WIDTH - self.size:
@@ -128,14 +172,58 @@ class Food:
         self.x = max(self.size, min(WINDOW_WIDTH - self.size, self.x))
         self.y = max(self.size, min(WINDOW_HEIGHT - self.size, self.y))
     
-    def draw(self, screen):
+    def draw(self, screen, alpha=1.0):
+        # 画食物：直接贴预先渲染好的红色圆点+分数贴图
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        y = self.prev_y + (self.y - self.prev_y) * alpha
+        return screen.blit(get_food_sprite(self.score, self.size), (x - self.size, y - self.size))
+
+def food_speed(score):
+    # 速度范围: 60 到 222 像素/秒（每帧1.0到3.7像素）
+    return (FOOD_BASE_SPEED + (score - 1) * FOOD_SPEED_STEP) * TICK_RATE
+
+# 字体和食物贴图缓存，避免每帧重复创建字体、渲染文字
+SPRITE_COLORKEY = (255, 0, 255)
+_fonts = {}
+_food_sprites = {}
+
+def get_font(size):
+    font = _fonts.get(size)
+    if font is None:
+        font = _fonts[size] = pygame.font.Font(None, size)
+    return font
+
+def get_food_sprite(score, size=FOOD_SIZE):
+    # 每种分数的食物贴图只在第一次用到时渲染一次
+    key = (score, int(size))
+    sprite = _food_sprites.get(key)
+    if sprite is None:
+        radius = key[1]
+        sprite = pygame.Surface((radius * 2, radius * 2))
+        # 圆点以外的部分用透明色键（比逐像素alpha混合贴图快）
+        sprite.fill(SPRITE_COLORKEY)
+        sprite.set_colorkey(SPRITE_COLORKEY, pygame.RLEACCEL)
         # 画食物（红色圆点）
-        pygame.draw.circle(screen, RED, (self.x, self.y), self.size)
+        pygame.draw.circle(sprite, RED, (radius, radius), radius)
         # 显示分数
-        font = pygame.font.Font(None, 28)  # 增大字体
-        text = font.render(str(self.score), True, WHITE)
-        text_rect = text.get_rect(center=(self.x, self.y))
-        screen.blit(text, text_rect)
+        text = get_font(28).render(str(score), True, WHITE)
+        sprite.blit(text, text.get_rect(center=(radius, radius)))
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert()
+        _food_sprites[key] = sprite
+    return sprite
+
+def prebake_food_sprites():
+    # 启动时预先渲染1-10分的全部食物贴图
+    for score in range(1, 11):
+        get_food_sprite(score)
+
+def draw_foods(screen, foods, alpha=1.0):
+    # 批量绘制：一次Surface.blits调用画完所有食物
+    return screen.blits([(get_food_sprite(food.score, food.size),
+                          (food.prev_x + (food.x - food.prev_x) * alpha - food.size,
+                           food.prev_y + (food.y - food.prev_y) * alpha - food.size))
+                         for food in foods])
 
 def check_collision(duck, food):
     # 检查鸭子身体碰撞
@@ -150,121 +238,588 @@ def check_collision(duck, food):
         beak_y = int(duck.y - duck.size * 0.18)
         beak_size = int(duck.size * 0.27)
         straw_start_x = beak_x + beak_size
-        straw_end_x = straw_start_x + 80
+        straw_end_x = straw_start_x + STRAW_LENGTH
         
         # 检查食物是否在吸管范围内
         if (straw_start_x <= food.x <= straw_end_x and 
-            abs(food.y - beak_y) < food.size + 8):
+            abs(food.y - beak_y) < food.size + STRAW_WIDTH):
             return True
     
     return False
 
-def draw_text(screen, text, x, y, size=36, color=BLACK):
-    font = pygame.font.Font(None, size)
-    text_surface = font.render(text, True, color)
-    screen.blit(text_surface, (x, y))
-
-def main():
-    # 创建游戏对象
-    duck = Duck()
-    foods = []
-    score = 0
-    last_milestone = 0  # 上一个里程碑分数
-    milestone_message = ""  # 里程碑消息
-    milestone_timer = 0  # 消息显示计时器
-    
-    # 创建初始食物
-    for _ in range(5):
-        foods.append(Food())
-    
-    # 游戏主循环
-    running = True
-    while running:
-        # 处理事件
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-        
-        # 获取按键状态
-        keys = pygame.key.get_pressed()
-        
-        # 更新游戏对象
-        duck.move(keys)
-        
-        # 更新食物位置
-        for food in foods:
-            food.update()
-        
-        # 检查碰撞
-        for food in foods[:]:  # 使用切片复制列表来安全地删除元素
+class SpatialGrid:
+    # 均匀网格粗检测：按食物中心所在格子分桶，碰撞时只检查相关格子
+    def __init__(self, cell_size=GRID_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}  # 格子坐标 -> {物体: None}（用字典保持插入顺序）
+        self.item_cells = {}  # 物体 -> 所在格子坐标
+    
+    def __len__(self):
+        return len(self.item_cells)
+    
+    def __iter__(self):
+        return iter(self.item_cells)
+    
+    def cell_of(self, x, y):
+        return (int(x // self.cell_size), int(y // self.cell_size))
+    
+    def insert(self, item):
+        cell = self.cell_of(item.x, item.y)
+        self.item_cells[item] = cell
+        self.cells.setdefault(cell, {})[item] = None
+    
+    def remove(self, item):
+        # O(1)删除：直接从所在格子的桶里去掉
+        cell = self.item_cells.pop(item)
+        bucket = self.cells[cell]
+        del bucket[item]
+        if not bucket:
+            del self.cells[cell]
+    
+    def move(self, item):
+        # 物体移动后调用，只有跨格子时才重新分桶
+        cell = self.cell_of(item.x, item.y)
+        old_cell = self.item_cells[item]
+        if cell != old_cell:
+            bucket = self.cells[old_cell]
+            del bucket[item]
+            if not bucket:
+                del self.cells[old_cell]
+            self.cells.setdefault(cell, {})[item] = None
+            self.item_cells[item] = cell
+    
+    def query(self, left, top, right, bottom):
+        # 返回与矩形重叠的格子里的所有物体
+        found = []
+        left_cell, top_cell = self.cell_of(left, top)
+        right_cell, bottom_cell = self.cell_of(right, bottom)
+        if (right_cell - left_cell + 1) * (bottom_cell - top_cell + 1) > len(self.cells):
+            # 矩形覆盖的格子比有物体的格子还多时，直接遍历有物体的格子
+            for (cx, cy), bucket in self.cells.items():
+                if left_cell <= cx <= right_cell and top_cell <= cy <= bottom_cell:
+                    found.extend(bucket)
+            return found
+        for cx in range(left_cell, right_cell + 1):
+            for cy in range(top_cell, bottom_cell + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket:
+                    found.extend(bucket)
+        return found
+
+def collision_candidates(duck, grid):
+    # 鸭子身体圆覆盖的格子（按食物半径外扩）
+    reach = duck.size + FOOD_SIZE
+    candidates = grid.query(duck.x - reach, duck.y - reach, duck.x + reach, duck.y + reach)
+    
+    # 吸管线段覆盖的格子
+    if duck.has_straw:
+        beak_x = int(duck.x + duck.size * 0.67)
+        beak_y = int(duck.y - duck.size * 0.18)
+        beak_size = int(duck.size * 0.27)
+        straw_start_x = beak_x + beak_size
+        reach = FOOD_SIZE + STRAW_WIDTH
+        candidates.extend(grid.query(straw_start_x, beak_y - reach,
+                                     straw_start_x + STRAW_LENGTH, beak_y + reach))
+    
+    # 去重并保持顺序
+    return list(dict.fromkeys(candidates))
+
+class FoodGrid(SpatialGrid):
+    # 每个食物一个Food对象，用空间网格做碰撞粗检测
+    def __init__(self, count, seed=None, cell_size=GRID_CELL_SIZE):
+        super().__init__(cell_size)
+        self.rng = random.Random(seed)
+        for _ in range(count):
+            self.insert(Food(self.rng))
+    
+    def update(self, dt=DT):
+        for food in self:
+            food.update(dt)
+            self.move(food)  # 跨格子时更新网格
+    
+    def collect(self, duck):
+        # 返回被吃掉的食物分数，并补充同样数量的新食物
+        scores = []
+        for food in collision_candidates(duck, self):
             if check_collision(duck, food):
-                foods.remove(food)
-                score += food.score  # 使用食物的分数
-                
-                # 检查里程碑
-                if score >= 100 and score // 100 > last_milestone:
-                    last_milestone = score // 100
-                    # 增大鸭子尺寸10%
-                    duck.size = int(duck.base_size * (1 + 0.1 * last_milestone))
-                    milestone_message = f"Milestone! {last_milestone * 100} points! Duck grows bigger!"
-                    milestone_timer = 180  # 显示3秒（60帧/秒）
-                
-                # 500分时获得吸管
-                if score >= 500 and not duck.has_straw:
-                    duck.has_straw = True
-                    milestone_message = "500 points! You got a long straw!"
-                    milestone_timer = 180
-                
-                # 播放收集音效
-                if sounds_enabled and collect_sound:
-                    collect_sound.play()
-                # 添加新食物
-                foods.append(Food())
-        
-        # 绘制游戏画面
-        screen.fill(BLUE)  # 天空蓝色背景
-        
-        # 画云朵装饰
-        pygame.draw.circle(screen, WHITE, (100, 100), 30)
-        pygame.draw.circle(screen, WHITE, (120, 100), 25)
-        pygame.draw.circle(screen, WHITE, (140, 100), 30)
-        
-        pygame.draw.circle(screen, WHITE, (600, 150), 25)
-        pygame.draw.circle(screen, WHITE, (620, 150), 30)
-        pygame.draw.circle(screen, WHITE, (640, 150), 25)
-        
-        # 画太阳
-        pygame.draw.circle(screen, YELLOW, (700, 80), 40)
+                self.remove(food)
+                scores.append(food.score)
+                self.insert(Food(self.rng))
+        return scores
+    
+    def nearest(self, x, y):
+        # 离(x, y)最近的食物位置，没有食物时返回None
+        food = min(self, key=lambda f: (f.x - x) ** 2 + (f.y - y) ** 2, default=None)
+        return None if food is None else (food.x, food.y)
+    
+    def draw(self, screen, alpha=1.0):
+        return draw_foods(screen, self, alpha)
+
+class FoodSwarm:
+    # 结构数组形式的食物群：位置、速度、尺寸、分数各存一个连续的NumPy数组，
+    # 整个食物群一次性向量化更新，适合上万个食物
+    def __init__(self, count, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self.x = np.zeros(count)
+        self.y = np.zeros(count)
+        self.prev_x = np.zeros(count)  # 上一步的位置，用于渲染插值
+        self.prev_y = np.zeros(count)
+        self.vx = np.zeros(count)
+        self.vy = np.zeros(count)
+        self.size = np.full(count, float(FOOD_SIZE))
+        self.score = np.zeros(count, dtype=np.int64)
+        self.spawn(np.arange(count))
+    
+    def __len__(self):
+        return len(self.x)
+    
+    def spawn(self, index):
+        # 在给定下标处生成新食物，规则与Food.__init__相同
+        n = len(index)
+        rng = self.rng
+        self.x[index] = rng.integers(40, WINDOW_WIDTH - 40, n, endpoint=True)
+        self.y[index] = rng.integers(40, WINDOW_HEIGHT - 40, n, endpoint=True)
+        self.prev_x[index] = self.x[index]
+        self.prev_y[index] = self.y[index]
+        score = rng.integers(1, 10, n, endpoint=True)
+        self.score[index] = score
+        base_speed = food_speed(score)
+        self.vx[index] = rng.choice([-1, 1], n) * base_speed
+        self.vy[index] = rng.choice([-1, 1], n) * base_speed
+    
+    def update(self, dt=DT):
+        x, y, vx, vy, size = self.x, self.y, self.vx, self.vy, self.size
+        np.copyto(self.prev_x, x)
+        np.copyto(self.prev_y, y)
+        x += vx * dt
+        y += vy * dt
         
-        # 画池塘边界
-        pygame.draw.rect(screen, GREEN, (50, WINDOW_HEIGHT - 150, WINDOW_WIDTH-100, 100))
+        # 碰到边界反弹
+        np.negative(vx, out=vx, where=(x <= size) | (x >= WINDOW_WIDTH - size))
+        np.negative(vy, out=vy, where=(y <= size) | (y >= WINDOW_HEIGHT - size))
         
-        # 绘制游戏对象
-        duck.draw(screen)
-        for food in foods:
-            food.draw(screen)
+        # 确保不越界
+        np.clip(x, size, WINDOW_WIDTH - size, out=x)
+        np.clip(y, size, WINDOW_HEIGHT - size, out=y)
+    
+    def hit_mask(self, duck):
+        # 与check_collision相同的判定，返回每个食物是否被吃到
+        dx = self.x - duck.x
+        dy = self.y - duck.y
+        reach = duck.size + self.size
+        mask = dx * dx + dy * dy < reach * reach
         
-        # 绘制分数
-        draw_text(screen, f"Score: {score}", 10, 10, 48, WHITE)
+        if duck.has_straw:
+            beak_x = int(duck.x + duck.size * 0.67)
+            beak_y = int(duck.y - duck.size * 0.18)
+            beak_size = int(duck.size * 0.27)
+            straw_start_x = beak_x + beak_size
+            straw_end_x = straw_start_x + STRAW_LENGTH
+            mask |= ((self.x >= straw_start_x) & (self.x <= straw_end_x) &
+                     (np.abs(self.y - beak_y) < self.size + STRAW_WIDTH))
+        return mask
+    
+    def collect(self, duck):
+        # 返回被吃掉的食物分数，并在原位置的下标处生成新食物
+        index = np.flatnonzero(self.hit_mask(duck))
+        if len(index) == 0:
+            return []
+        scores = self.score[index].tolist()
+        self.spawn(index)
+        return scores
+    
+    def nearest(self, x, y):
+        # 离(x, y)最近的食物位置，没有食物时返回None
+        if len(self) == 0:
+            return None
+        i = int(np.argmin((self.x - x) ** 2 + (self.y - y) ** 2))
+        return (float(self.x[i]), float(self.y[i]))
+    
+    def visible_mask(self, left, top, screen_size, cell=FOOD_CULL_CELL):
+        # 食物按下标顺序绘制，后画的盖住先画的。返回每个食物是否还有像素露在外面（保守判断，
+        # 结果与全部绘制逐像素相同）：
+        # cover[格子] = 完全盖住该格子的最后一个食物下标，由每个格子最后一个圆心所在的食物
+        # 按“完全在圆内的格子”模板做最大值膨胀得到；食物可能碰到的格子里只要有一个
+        # cover不大于它自己的下标，它就露在外面（最小值腐蚀，用正方形模板分两次一维完成）
+        count = len(left)
+        width, height = screen_size
+        reach = int(np.ceil(self.size.max() / cell)) + 1  # 圆可能碰到的格子离圆心格子的最远距离
+        offsets = np.arange(-reach, reach + 1)
+        di, dj = np.meshgrid(offsets, offsets, indexing="ij")
+        # 圆心格子里任何一点到这些格子的最远角都在半径以内（留1.5像素给取整和抗锯齿）
+        inside = np.hypot((np.abs(di) + 1) * cell, (np.abs(dj) + 1) * cell) <= self.size.min() - 1.5
+        columns = width // cell + 1 + 2 * reach
+        rows = height // cell + 1 + 2 * reach
+        cx = np.clip(((left + self.size) // cell).astype(np.intp), 0, width // cell) + reach
+        cy = np.clip(((top + self.size) // cell).astype(np.intp), 0, height // cell) + reach
+        center = cx * rows + cy
+        newest = np.full(columns * rows, -1, np.int32)
+        newest[center] = np.arange(count, dtype=np.int32)  # 下标重复时保留最后一个
+        newest = newest.reshape(columns, rows)
+        inner_x = slice(reach, columns - reach)
+        inner_y = slice(reach, rows - reach)
+        cover = np.full((columns, rows), -1, np.int32)
+        for i, j in zip(di[inside].tolist(), dj[inside].tolist()):
+            np.maximum(cover[inner_x, inner_y], newest[reach + i:columns - reach + i, reach + j:rows - reach + j],
+                       out=cover[inner_x, inner_y])
+        lowest = np.full((columns, rows), count, np.int32)
+        for i in range(-reach, reach + 1):
+            np.minimum(lowest[inner_x], cover[reach + i:columns - reach + i], out=lowest[inner_x])
+        nearby = np.full((columns, rows), count, np.int32)
+        for j in range(-reach, reach + 1):
+            np.minimum(nearby[:, inner_y], lowest[:, reach + j:rows - reach + j], out=nearby[:, inner_y])
+        return nearby.ravel()[center] <= np.arange(count)
+    
+    def draw(self, screen, alpha=1.0):
+        x = self.prev_x + (self.x - self.prev_x) * alpha - self.size
+        y = self.prev_y + (self.y - self.prev_y) * alpha - self.size
+        size, score = self.size, self.score
+        width, height = screen.get_size()
+        if np.pi * np.sum(size * size) > FOOD_CULL_OVERDRAW * width * height:
+            # 食物层层重叠时大部分完全被盖住，只画露在外面的（5万个食物时约1.2万个）
+            index = np.flatnonzero(self.visible_mask(x, y, (width, height)))
+            x, y, size, score = x[index], y[index], size[index], score[index]
+        return screen.blits([(get_food_sprite(score, size), (left, top))
+                             for left, top, size, score in zip(x.tolist(), y.tolist(),
+                                                               size.tolist(), score.tolist())])
+
+def make_foods(count, swarm=False, seed=None):
+    if swarm:
+        return FoodSwarm(count, seed)
+    return FoodGrid(count, seed)
+
+def draw_text(screen, text, x, y, size=36, color=BLACK):
+    text_surface = get_font(size).render(text, True, color)
+    return screen.blit(text_surface, (x, y))
+
+def build_background(size):
+    # 静态背景层：天空、云朵、太阳、池塘和说明文字
+    width, height = size
+    background = pygame.Surface(size)
+    background.fill(BLUE)  # 天空蓝色背景
+    
+    # 画云朵装饰
+    pygame.draw.circle(background, WHITE, (100, 100), 30)
+    pygame.draw.circle(background, WHITE, (120, 100), 25)
+    pygame.draw.circle(background, WHITE, (140, 100), 30)
+    
+    pygame.draw.circle(background, WHITE, (600, 150), 25)
+    pygame.draw.circle(background, WHITE, (620, 150), 30)
+    pygame.draw.circle(background, WHITE, (640, 150), 25)
+    
+    # 画太阳
+    pygame.draw.circle(background, YELLOW, (700, 80), 40)
+    
+    # 画池塘边界
+    pygame.draw.rect(background, GREEN, (50, height - 150, width - 100, 100))
+    
+    # 绘制说明
+    draw_text(background, "Use arrow keys to move the duck and collect red food!", 10, height - 40, 24, WHITE)
+    
+    if pygame.display.get_surface() is not None:
+        background = background.convert()
+    return background
+
+class SceneRenderer:
+    # 分层渲染：静态背景只画一次并缓存，每帧只擦除和刷新鸭子、食物、文字所在的矩形
+    def __init__(self, max_dirty_rects=MAX_DIRTY_RECTS):
+        self.background = None
+        self.max_dirty_rects = max_dirty_rects
+        self.dirty_rects = []  # 上一帧画过的矩形
+        self.full_redraw = True
+    
+    def begin(self, screen):
+        # 窗口尺寸变化时才重建背景缓存
+        if self.background is None or self.background.get_size() != screen.get_size():
+            self.background = build_background(screen.get_size())
+            self.full_redraw = True
         
-        # 绘制里程碑消息
-        if milestone_timer > 0:
-            # 创建闪烁效果
-            if milestone_timer % 20 < 15:  # 闪烁
-                draw_text(screen, milestone_message, WINDOW_WIDTH // 2 - 200, 
-                         WINDOW_HEIGHT // 2 - 100, 48, YELLOW)
-            milestone_timer -= 1
+        # 用背景缓存擦除上一帧画过的区域；矩形太多时直接整屏贴背景
+        if self.full_redraw or len(self.dirty_rects) > self.max_dirty_rects:
+            screen.blit(self.background, (0, 0))
+        else:
+            screen.blits([(self.background, rect, rect) for rect in self.dirty_rects], doreturn=False)
+    
+    def finish(self, rects):
+        # 返回需要推到屏幕上的矩形（擦除过的和新画的），返回None表示整屏刷新
+        if self.full_redraw or len(rects) + len(self.dirty_rects) > self.max_dirty_rects:
+            update_rects = None
+        else:
+            update_rects = self.dirty_rects + rects
+        self.dirty_rects = rects
+        self.full_redraw = False
+        return update_rects
+
+class GameState:
+    # 一局游戏的全部状态，由step()按固定步长推进
+    def __init__(self, food_count=5, swarm=False, seed=None):
+        # 随机数只来自这个种子，同样的种子和按键一定得到同样的一局
+        if seed is not None and not 0 <= seed < SEED_LIMIT:
+            raise ValueError(f"seed must be between 0 and 2**64 - 1, got {seed}")
+        if not 0 <= food_count < FOOD_COUNT_LIMIT:
+            raise ValueError(f"food count must be between 0 and 2**32 - 1, got {food_count}")
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.food_count = food_count
+        self.swarm = swarm
+        self.duck = Duck()
+        self.foods = make_foods(food_count, swarm, self.seed)  # 大量食物时用NumPy食物群
+        self.score = 0
+        self.last_milestone = 0  # 上一个里程碑分数
+        self.milestone_message = ""  # 里程碑消息
+        self.milestone_timer = 0.0  # 消息剩余显示时间（秒）
+        self.milestone_ticks = {}  # 里程碑分数 -> 达到时的步数
+        self.straw_tick = None  # 获得吸管时的步数
+        self.tick = 0  # 已经模拟的步数
+    
+    @property
+    def time(self):
+        return self.tick * DT
+
+def advance(state, inputs, dt=DT):
+    # 移动鸭子和食物，推进计时器
+    state.duck.move(inputs, dt)
+    state.foods.update(dt)
+    state.milestone_timer = max(0.0, state.milestone_timer - dt)
+
+def collect_food(state):
+    # 检查碰撞（被吃掉的食物会自动补充新的），返回本步吃到的食物分数
+    duck = state.duck
+    collected = state.foods.collect(duck)
+    for food_score in collected:
+        state.score += food_score  # 使用食物的分数
         
-        # 绘制说明
-        draw_text(screen, "Use arrow keys to move the duck and collect red food!", 10, WINDOW_HEIGHT - 40, 24, WHITE)
+        # 检查里程碑
+        if state.score >= MILESTONE_POINTS and state.score // MILESTONE_POINTS > state.last_milestone:
+            state.last_milestone = state.score // MILESTONE_POINTS
+            # 增大鸭子尺寸10%
+            duck.size = int(duck.base_size * (1 + MILESTONE_GROWTH * state.last_milestone))
+            state.milestone_message = f"Milestone! {state.last_milestone * MILESTONE_POINTS} points! Duck grows bigger!"
+            state.milestone_timer = MILESTONE_DISPLAY_TIME
+            state.milestone_ticks[state.last_milestone * MILESTONE_POINTS] = state.tick
         
-        # 更新显示
-        pygame.display.flip()
-        clock.tick(60)  # 60帧每秒
+        # 500分时获得吸管
+        if state.score >= STRAW_SCORE and not duck.has_straw:
+            duck.has_straw = True
+            state.milestone_message = f"{STRAW_SCORE} points! You got a long straw!"
+            state.milestone_timer = MILESTONE_DISPLAY_TIME
+            state.straw_tick = state.tick
+    return collected
+
+def step(state, inputs, dt=DT, profiler=NULL_PROFILER):
+    # 固定步长的一步游戏逻辑，不涉及绘制和声音
+    advance(state, inputs, dt)
+    profiler.mark("update")
+    collected = collect_food(state)
+    profiler.mark("collision")
+    state.tick += 1
+    return collected
+
+def draw_scene(screen, renderer, state, alpha=1.0):
+    # 绘制游戏画面，返回画过的矩形：先用背景缓存擦除上一帧
+    renderer.begin(screen)
+    
+    # 绘制游戏对象（在两个逻辑步之间插值）
+    rects = [state.duck.draw(screen, alpha)]
+    rects.extend(state.foods.draw(screen, alpha))
+    
+    # 绘制分数
+    rects.append(draw_text(screen, f"Score: {state.score}", 10, 10, 48, WHITE))
+    
+    # 绘制里程碑消息（闪烁效果）
+    if state.milestone_timer > 0 and state.milestone_timer % MILESTONE_BLINK_PERIOD < MILESTONE_BLINK_ON:
+        rects.append(draw_text(screen, state.milestone_message, WINDOW_WIDTH // 2 - 200, 
+                               WINDOW_HEIGHT // 2 - 100, 48, YELLOW))
+    return rects
+
+def run_headless(seconds, policy=None, food_count=5, swarm=False, seed=None):
+    # 无界面模式：不创建窗口、不限帧率，尽可能快地模拟
+    state = GameState(food_count, swarm, seed)
+    for _ in range(int(seconds * TICK_RATE)):
+        inputs = policy(state) if policy else NO_INPUT
+        step(state, inputs)
+    return state
+
+def final_snapshot(state):
+    # 用来校验录像的最终状态
+    duck = state.duck
+    return (state.score, duck.x, duck.y, duck.size, duck.has_straw)
+
+class Replay:
+    # 一局游戏的录像：随机种子+每步一个字节的按键，可以无界面全速重放
+    def __init__(self, seed, food_count=5, swarm=False, inputs=b"", final=None):
+        self.seed = seed
+        self.food_count = food_count
+        self.swarm = swarm
+        self.inputs = bytearray(inputs)
+        self.final = final  # 录制结束时的final_snapshot
+    
+    @classmethod
+    def for_state(cls, state):
+        return cls(state.seed, state.food_count, state.swarm)
+    
+    def record(self, inputs):
+        self.inputs.append(pack_inputs(inputs))
+    
+    def finish(self, state):
+        self.final = final_snapshot(state)
+    
+    def to_bytes(self):
+        score, duck_x, duck_y, duck_size, has_straw = self.final
+        header = REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.seed, self.food_count,
+                                    self.swarm, len(self.inputs), score, duck_x, duck_y,
+                                    duck_size, has_straw)
+        return header + zlib.compress(bytes(self.inputs), 9)
+    
+    @classmethod
+    def from_bytes(cls, data):
+        (magic, version, seed, food_count, swarm, ticks, score, duck_x, duck_y,
+         duck_size, has_straw) = REPLAY_HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError("Not a duck game replay (or unsupported version)")
+        inputs = zlib.decompress(data[REPLAY_HEADER.size:])
+        if len(inputs) != ticks:
+            raise ValueError(f"Replay is truncated: expected {ticks} ticks, got {len(inputs)}")
+        return cls(seed, food_count, bool(swarm), inputs,
+                   (score, duck_x, duck_y, duck_size, bool(has_straw)))
+    
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+    
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+    
+    def play(self):
+        # 无界面全速重放，返回最终的游戏状态
+        state = GameState(self.food_count, self.swarm, self.seed)
+        decoded = [unpack_inputs(byte) for byte in range(16)]
+        for byte in self.inputs:
+            step(state, decoded[byte])
+        return state
+    
+    def verify(self):
+        # 重放结果和录制时的最终状态完全一致才算通过
+        return final_snapshot(self.play()) == self.final
+
+def verify_replays(paths):
+    all_ok = True
+    for path in paths:
+        replay = Replay.load(path)
+        start = time.perf_counter()
+        ok = replay.verify()
+        elapsed = time.perf_counter() - start
+        all_ok = all_ok and ok
+        size = len(replay.to_bytes())
+        print(f"{'OK      ' if ok else 'MISMATCH'} {path}: {len(replay.inputs)} ticks, {size} bytes "
+              f"({size / max(len(replay.inputs), 1):.3f} bytes/tick), replayed in {elapsed:.3f}s")
+    return all_ok
+
+def init_sound(runtime):
+    # 音效系统：返回收集音效，没有音效或混音器初始化失败时返回None
+    collect_sound = None
+    if not runtime.sound_enabled:
+        return None
+    
+    # 尝试加载音效文件
+    try:
+        # collect_sound = pygame.mixer.Sound("sounds/collect.wav")
+        # collect_sound.set_volume(0.5)
+        pass
+    except:
+        print("Warning: Could not load collect sound")
+    
+    # 尝试加载背景音乐
+    try:
+        # pygame.mixer.music.load("sounds/background.mp3")
+        # pygame.mixer.music.set_volume(0.3)
+        # pygame.mixer.music.play(-1)  # -1 表示循环播放
+        pass
+    except:
+        print("Warning: Could not load background music")
+    return collect_sound
+
+class DuckScene(Scene):
+    # 窗口版游戏：每帧按真实经过的时间推进若干个固定步长，只重画变化的区域
+    size = (WINDOW_WIDTH, WINDOW_HEIGHT)
+    caption = "Duck Collection Game"
+
+    def __init__(self, food_count=5, swarm=False, seed=None, record=None, collect_sound=None):
+        # 创建游戏对象
+        self.state = GameState(food_count, swarm, seed)
+        self.record = record
+        self.replay = Replay.for_state(self.state) if record else None
+        self.collect_sound = collect_sound
+        prebake_food_sprites()
+        self.renderer = SceneRenderer()
+        self.accumulator = 0.0  # 还没模拟的真实时间
+
+    def update(self, dt):
+        # 获取按键状态
+        inputs = inputs_from_keys(pygame.key.get_pressed())
+        self.accumulator += min(dt, MAX_FRAME_TIME)
+        while self.accumulator >= DT:
+            if self.replay:
+                self.replay.record(inputs)
+            collected = step(self.state, inputs, profiler=self.profiler)
+            # 播放收集音效
+            if collected and self.collect_sound:
+                self.collect_sound.play()
+            self.accumulator -= DT
+
+    def draw(self, screen):
+        # 绘制时在两个逻辑步之间插值，只返回变化的区域
+        rects = draw_scene(screen, self.renderer, self.state, self.accumulator / DT)
+        return self.renderer.finish(rects)
+
+    def close(self):
+        # 保存录像
+        if self.replay:
+            state = self.state
+            self.replay.finish(state)
+            self.replay.save(self.record)
+            print(f"Replay saved to {self.record} ({len(self.replay.inputs)} ticks, score {state.score})")
+            self.replay = None
+
+def main(food_count=5, swarm=False, seed=None, record=None):
+    # 初始化Pygame，设置游戏窗口和声音
+    runtime = GameRuntime(DuckScene.size, DuckScene.caption, sound=True).start()
+    scene = DuckScene(food_count, swarm, seed, record, init_sound(runtime))
+    runtime.run(scene, FPS)
     
     # 退出游戏
-    pygame.quit()
+    runtime.close()
     sys.exit()
 
+def bounded_int(limit):
+    # argparse类型：0到limit - 1之间的整数，超出范围在开局前就报错，而不是录完一局才保存失败
+    def parse(text):
+        value = int(text)
+        if not 0 <= value < limit:
+            raise argparse.ArgumentTypeError(f"must be between 0 and {limit - 1}")
+        return value
+    return parse
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Duck Collection Game")
+    parser.add_argument("--foods", type=bounded_int(FOOD_COUNT_LIMIT), default=5,
+                        help="number of food items on screen")
+    parser.add_argument("--swarm", action="store_true", help="use the NumPy food swarm engine")
+    parser.add_argument("--seed", type=bounded_int(SEED_LIMIT), help="random seed (default: pick one)")
+    parser.add_argument("--headless", type=float, metavar="SECONDS",
+                        help="simulate SECONDS of game time without a window and print the result")
+    parser.add_argument("--record", metavar="PATH", help="record the session's key presses to a replay file")
+    parser.add_argument("--replay", nargs="+", metavar="PATH",
+                        help="re-run replay files headlessly and check the final score and duck state")
+    args = parser.parse_args()
+    if args.replay:
+        sys.exit(0 if verify_replays(args.replay) else 1)
+    elif args.headless is not None:
+        start = time.perf_counter()
+        state = run_headless(args.headless, food_count=args.foods, swarm=args.swarm, seed=args.seed)
+        elapsed = time.perf_counter() - start
+        print(f"Simulated {state.time:.0f}s ({state.tick} ticks) in {elapsed:.3f}s wall clock "
+              f"({state.time / elapsed:.0f}x real time), score {state.score}")
+    else:
+        main(food_count=args.foods, swarm=args.swarm, seed=args.seed, record=args.record)
\ No newline at end of file
@@ -0,0 +1,157 @@
+"""
+Lightweight per-phase frame-time profiler shared by all the games.
+
+Each main loop calls begin_frame(), then mark(phase) after each phase of the
+frame (events, update, collision, draw, flip) and end_frame() before waiting
+on the clock. Rolling p50/p95/p99 per phase can be drawn as an on-screen
+overlay and every frame can be streamed to a JSONL or CSV file. The overlay
+keeps a copy of the pixels it covers, and erase_overlay() puts them back, so
+a scene that only redraws its dirty rects never sees the overlay.
+
+Enable it with the GAME_PROFILE environment variable:
+    GAME_PROFILE=1               on-screen overlay only
+    GAME_PROFILE=frames.jsonl    overlay + one JSON record per frame
+    GAME_PROFILE=frames.csv      overlay + one CSV row per frame
+When disabled, the methods are replaced with a no-op so the profiler can
+stay in production builds.
+"""
+import csv
+import json
+import os
+import time
+from collections import deque
+
+import pygame
+
+PHASES = ("events", "update", "collision", "draw", "flip")
+OVERLAY_REFRESH_FRAMES = 30  # re-render the overlay text twice a second at 60 FPS
+OVERLAY_COLOR = (255, 255, 255)
+OVERLAY_BACKGROUND = (0, 0, 0)
+
+
+def _noop(*args):
+    return None
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+class FrameProfiler:
+    def __init__(self, enabled=False, overlay=True, log_path=None, window=300):
+        self.enabled = enabled
+        if not enabled:
+            # Shadow the methods with a shared no-op: one attribute lookup and call per mark
+            self.begin_frame = self.mark = self.end_frame = _noop
+            self.draw_overlay = self.erase_overlay = self.close = _noop
+            return
+
+        self.overlay = overlay
+        self.samples = {phase: deque(maxlen=window) for phase in PHASES + ("frame",)}
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.seen = []  # phases marked at least once, in first-seen order
+        self.frame_start = self.last = time.perf_counter()
+        self.frame_index = 0
+        self.overlay_surface = None
+        self.font = None
+        self.under = None  # (copy of the pixels under the overlay, their rect)
+
+        self.log_file = None
+        self.csv_writer = None
+        if log_path:
+            self.log_file = open(log_path, "w", newline="")
+            if log_path.endswith(".csv"):
+                self.csv_writer = csv.writer(self.log_file)
+                self.csv_writer.writerow(("frame",) + PHASES + ("total",))
+
+    @classmethod
+    def from_env(cls, variable="GAME_PROFILE"):
+        setting = os.environ.get(variable, "")
+        if setting in ("", "0"):
+            return cls(enabled=False)
+        if setting in ("1", "overlay"):
+            return cls(enabled=True)
+        return cls(enabled=True, log_path=setting)
+
+    def begin_frame(self):
+        self.frame_start = self.last = time.perf_counter()
+        for phase in self.current:
+            self.current[phase] = 0.0
+
+    def mark(self, phase):
+        # Charge the time since the previous mark to phase; repeated marks accumulate
+        now = time.perf_counter()
+        self.current[phase] += now - self.last
+        self.last = now
+        if phase not in self.seen:
+            self.seen.append(phase)
+
+    def end_frame(self):
+        total = time.perf_counter() - self.frame_start
+        for phase, seconds in self.current.items():
+            self.samples[phase].append(seconds * 1000)
+        self.samples["frame"].append(total * 1000)
+
+        if self.log_file:
+            record = [round(self.current[phase] * 1000, 4) for phase in PHASES]
+            if self.csv_writer:
+                self.csv_writer.writerow([self.frame_index] + record + [round(total * 1000, 4)])
+            else:
+                row = {"frame": self.frame_index, **dict(zip(PHASES, record)), "total": round(total * 1000, 4)}
+                self.log_file.write(json.dumps(row) + "\n")
+
+        if self.frame_index % OVERLAY_REFRESH_FRAMES == 0:
+            self.overlay_surface = None
+        self.frame_index += 1
+
+    def percentiles(self, phase):
+        values = sorted(self.samples[phase])
+        return percentile(values, 0.50), percentile(values, 0.95), percentile(values, 0.99)
+
+    def report_lines(self):
+        lines = [f"{'ms':<10}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        for phase in [phase for phase in PHASES if phase in self.seen] + ["frame"]:
+            p50, p95, p99 = self.percentiles(phase)
+            lines.append(f"{phase:<10}{p50:>7.2f}{p95:>7.2f}{p99:>7.2f}")
+        return lines
+
+    def draw_overlay(self, screen):
+        # Draw the rolling percentiles in the bottom-right corner and return the rect touched
+        if not self.overlay:
+            return None
+        if self.overlay_surface is None:
+            if self.font is None:
+                self.font = pygame.font.SysFont("monospace", 16)
+            rendered = [self.font.render(line, True, OVERLAY_COLOR) for line in self.report_lines()]
+            width = max(line.get_width() for line in rendered) + 12
+            line_height = self.font.get_linesize()
+            self.overlay_surface = pygame.Surface((width, line_height * len(rendered) + 8))
+            self.overlay_surface.fill(OVERLAY_BACKGROUND)
+            for i, line in enumerate(rendered):
+                self.overlay_surface.blit(line, (6, 4 + i * line_height))
+        screen_width, screen_height = screen.get_size()
+        width, height = self.overlay_surface.get_size()
+        rect = pygame.Rect(screen_width - width - 10, screen_height - height - 10, width, height)
+        rect = rect.clip(screen.get_rect())
+        self.under = (screen.subsurface(rect).copy(), rect)
+        return screen.blit(self.overlay_surface, rect)
+
+    def erase_overlay(self, screen):
+        # Put back what the last overlay covered; returns the rect restored, or None
+        if self.under is None:
+            return None
+        pixels, rect = self.under
+        self.under = None
+        return screen.blit(pixels, rect)
+
+    def close(self):
+        if self.log_file:
+            self.log_file.close()
+            self.log_file = None
+
+
+# Shared disabled profiler for code paths that take an optional profiler
+NULL_PROFILER = FrameProfiler(enabled=False)
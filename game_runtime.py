@@ -0,0 +1,110 @@
+"""
+Explicit pygame runtime shared by the games.
+
+Importing a game module does not initialize pygame or open a window; the
+game's main() creates a GameRuntime, which owns the window, the clock and,
+when asked for, the mixer, and runs the game's Scene:
+
+    runtime = GameRuntime((1200, 800), "Caption").start()
+    runtime.run(MyScene())
+    runtime.close()
+
+or as a context manager: ``with GameRuntime(size, caption) as runtime: ...``
+"""
+import pygame
+
+from frame_profiler import NULL_PROFILER, FrameProfiler
+
+FPS = 60
+
+
+class Scene:
+    """
+    Common interface of everything GameRuntime.run() (and the launcher) can host.
+
+    draw(screen) returns the list of rects it changed, or None when the whole
+    surface should be flipped. Only the runtime draws the profiler overlay,
+    on top of the scene, and it erases the overlay again before the next
+    draw, so a scene finds the screen exactly as it left it.
+    """
+    size = (800, 600)  # native surface size
+    caption = ""
+    profiler = NULL_PROFILER  # replaced by the runtime that hosts the scene
+
+    def handle_event(self, event):
+        pass
+
+    def update(self, dt):
+        pass
+
+    def draw(self, screen):
+        return None
+
+    def close(self):
+        pass
+
+
+class GameRuntime:
+    def __init__(self, size, caption, sound=False):
+        self.size = size
+        self.caption = caption
+        self.sound = sound
+        self.screen = None
+        self.clock = None
+        self.sound_enabled = False
+
+    def start(self):
+        # Only the subsystems the games use: pygame.init() would also open the mixer
+        pygame.display.init()
+        pygame.font.init()
+        self.screen = pygame.display.set_mode(self.size)
+        pygame.display.set_caption(self.caption)
+        self.clock = pygame.time.Clock()
+        if self.sound:
+            try:
+                pygame.mixer.init()
+                self.sound_enabled = True
+            except pygame.error:
+                print("Warning: Sound system could not be initialized")
+        return self
+
+    def run(self, scene, fps=FPS):
+        # Main loop shared by every game: events, update, draw, flip
+        profiler = FrameProfiler.from_env()  # GAME_PROFILE=1 shows per-phase frame times
+        scene.profiler = profiler
+        running = True
+        while running:
+            dt = self.clock.tick(fps) / 1000.0
+            profiler.begin_frame()
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                else:
+                    scene.handle_event(event)
+            profiler.mark("events")
+
+            scene.update(dt)
+            profiler.mark("update")
+
+            erased = profiler.erase_overlay(self.screen)
+            rects = scene.draw(self.screen)
+            overlay = profiler.draw_overlay(self.screen)
+            profiler.mark("draw")
+
+            if rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects + [rect for rect in (erased, overlay) if rect])
+            profiler.mark("flip")
+            profiler.end_frame()
+        scene.close()
+        profiler.close()
+
+    def close(self):
+        pygame.quit()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
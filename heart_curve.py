@@ -1,15 +1,26 @@
 import pygame
 import math
 import sys
+import numpy as np
+from curve_cache import CURVE_CACHE
+from game_runtime import GameRuntime, Scene
+from trail_buffer import TrailBuffer
+from trail_lod import LOD_TOLERANCE, DecimatedTrail
+from trail_render import TRAIL_RENDERERS, TrailCanvas, next_render_mode
 
-# Initialize Pygame
-pygame.init()
-
-# Window settings
+# Window settings (the window itself is opened by main())
 WINDOW_WIDTH = 1200
 WINDOW_HEIGHT = 800
-screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-pygame.display.set_caption("Mathematical Heart Curve with Turtle")
+
+HEART_RANGE = (0, 2 * math.pi)
+TRAIL_CAPACITY = 1000  # points kept in the turtle's trail
+TRAIL_FADE_POINTS = 315  # incremental mode: a segment fades from red to pink over about one full heart
+DRAW_RATE = 60  # curve samples drawn per second of real time (one per frame at 60 FPS)
+MAX_FRAME_TIME = 0.25  # longest frame caught up at once (e.g. after the window was dragged)
+MAX_SCALE = 20
+# Full-history mode keeps the trail in curve space: simplify it finely enough for the largest scale
+HEART_LOD_TOLERANCE = LOD_TOLERANCE / MAX_SCALE
+HEART_ORIGIN = (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 - 100)  # screen position of the curve's origin, a bit above center
 
 # Colors
 WHITE = (255, 255, 255)
@@ -19,45 +30,106 @@ GREEN = (0, 255, 0)
 BLACK = (0, 0, 0)
 BLUE = (0, 100, 255)
 
-# Clock
-clock = pygame.time.Clock()
-
 class Turtle:
-    def __init__(self):
+    def __init__(self, trail_capacity=TRAIL_CAPACITY, scale=1, origin=(0, 0)):
+        # The trail is kept in curve space; screen = curve * scale + origin
+        self.scale = scale
+        self.origin = origin
+        self.trail_capacity = trail_capacity
         self.x = WINDOW_WIDTH // 2
         self.y = WINDOW_HEIGHT // 2
         self.angle = 0
         self.size = 15
-        self.trail = []  # Store trail points
+        self.trail = TrailBuffer(trail_capacity)  # Oldest points drop off once full
+        self.screen_trail = TrailBuffer(trail_capacity)  # Cached screen projection of trail
+        self.canvas = None  # TrailCanvas when drawing incrementally
+        self.render_mode = "batched"  # one of trail_render.RENDER_MODES
         self.color = GREEN
         
     def move_to(self, x, y):
+        # x, y in curve space
+        sx = x * self.scale + self.origin[0]
+        sy = y * self.scale + self.origin[1]
         # Calculate angle for turtle orientation
         if len(self.trail) > 0:
-            dx = x - self.x
-            dy = y - self.y
+            dx = sx - self.x
+            dy = sy - self.y
             self.angle = math.atan2(dy, dx)
         
-        self.x = x
-        self.y = y
-        self.trail.append((x, y))
-        
-        # Limit trail length for performance
-        if len(self.trail) > 1000:
-            self.trail.pop(0)
+        self.x = sx
+        self.y = sy
+        self.trail.append(x, y)
+        self.screen_trail.append(sx, sy)
+        if self.canvas:
+            self.canvas.add_point(sx, sy)
+    
+    def move_along(self, points):
+        # Several curve-space points at once, as one batch per buffer and one canvas draw
+        if len(points) == 1:
+            self.move_to(*points[0])
+            return
+        screen_points = points * self.scale + self.origin
+        (px, py), (sx, sy) = screen_points[-2:]
+        self.angle = math.atan2(sy - py, sx - px)
+        self.x = sx
+        self.y = sy
+        self.trail.extend(points)
+        self.screen_trail.extend(screen_points)
+        if self.canvas:
+            self.canvas.add_points(screen_points)
+    
+    def set_scale(self, scale):
+        if scale != self.scale:
+            self.scale = scale
+            self.reproject()
+    
+    def reproject(self):
+        # One vectorized pass over the whole trail; only the canvas has to be redrawn
+        points = self.trail.view() * self.scale + self.origin
+        self.screen_trail.clear()
+        self.screen_trail.extend(points)
+        if len(points):
+            self.x, self.y = points[-1]
+        if self.canvas:
+            self.canvas.rebuild(self.screen_trail.view())
+    
+    def set_unbounded(self, unbounded):
+        # Full history: keep every point, simplifying older sections instead of dropping them
+        if unbounded:
+            trail = DecimatedTrail(HEART_LOD_TOLERANCE)
+            self.screen_trail = DecimatedTrail()
+        else:
+            trail = TrailBuffer(self.trail_capacity)
+            self.screen_trail = TrailBuffer(self.trail_capacity)
+        trail.extend(self.trail.view())
+        self.trail = trail
+        self.reproject()
+    
+    def clear_trail(self):
+        self.trail.clear()
+        self.screen_trail.clear()
+        if self.canvas:
+            self.canvas.reset()
+    
+    def set_render_mode(self, mode):
+        self.render_mode = mode
+        self.set_incremental(mode == "incremental")
+    
+    def set_incremental(self, incremental):
+        # Incremental mode draws only the newest segment onto a persistent canvas
+        if incremental:
+            self.canvas = TrailCanvas((WINDOW_WIDTH, WINDOW_HEIGHT), PINK, RED, 3, TRAIL_FADE_POINTS)
+            self.canvas.rebuild(self.screen_trail.view())
+        else:
+            self.canvas = None
     
     def draw(self, screen):
-        # Draw trail
-        if len(self.trail) > 1:
-            for i in range(1, len(self.trail)):
-                # Gradient effect for trail
-                alpha = i / len(self.trail)
-                color = (
-                    int(RED[0] * alpha + PINK[0] * (1 - alpha)),
-                    int(RED[1] * alpha + PINK[1] * (1 - alpha)),
-                    int(RED[2] * alpha + PINK[2] * (1 - alpha))
-                )
-                pygame.draw.line(screen, color, self.trail[i-1], self.trail[i], 3)
+        # Draw trail, fading from pink (oldest) to red (newest)
+        if self.canvas:
+            self.canvas.draw(screen)
+        else:
+            TRAIL_RENDERERS[self.render_mode](screen, self.screen_trail.view(), PINK, RED, 3,
+                                              rows=self.screen_trail.rows)
         
         # Draw turtle body
         pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.size)
@@ -67,64 +139,84 @@ class Turtle:
         head_y = self.y + self.size * 0.8 * math.sin(self.angle)
         pygame.draw.circle(screen, BLACK, (int(head_x), int(head_y)), 5)
 
+def heart_shape(t, scale=1):
+    """
+    Heart curve parametric equations, in curve space (centered on the origin)
+    t: parameter from 0 to 2*pi, a number or a NumPy array
+    scale: size multiplier
+    """
+    x = 16 * (np.sin(t) ** 3)
+    y = -(13 * np.cos(t) - 5 * np.cos(2*t) - 2 * np.cos(3*t) - np.cos(4*t))
+    return x * scale, y * scale
+
 def heart_curve(t, scale=5):
     """
-    Heart curve parametric equations
-    t: parameter from 0 to 2*pi
+    Heart curve in screen coordinates
+    t: parameter from 0 to 2*pi, a number or a NumPy array
     scale: size multiplier
     """
-    x = 16 * (math.sin(t) ** 3)
-    y = -(13 * math.cos(t) - 5 * math.cos(2*t) - 2 * math.cos(3*t) - math.cos(4*t))
-    
-    # Scale and center
-    x = x * scale + WINDOW_WIDTH // 2
-    y = y * scale + WINDOW_HEIGHT // 2 - 100  # Offset up a bit
-    
-    return x, y
+    x, y = heart_shape(t, scale)
+    return x + HEART_ORIGIN[0], y + HEART_ORIGIN[1]
 
 def draw_text(screen, text, x, y, size=24, color=BLACK):
     font = pygame.font.Font(None, size)
     text_surface = font.render(text, True, color)
     screen.blit(text_surface, (x, y))
 
-def main():
-    turtle = Turtle()
-    t = 0  # Parameter for curve
-    speed = 0.02  # How fast to draw
-    scale = 10  # Size of heart
-    paused = False
-    show_equation = True
-    
-    running = True
-    while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
-                    paused = not paused
-                elif event.key == pygame.K_r:
-                    # Reset
-                    turtle.trail.clear()
-                    t = 0
-                elif event.key == pygame.K_UP:
-                    scale = min(scale + 1, 20)
-                elif event.key == pygame.K_DOWN:
-                    scale = max(scale - 1, 3)
-                elif event.key == pygame.K_e:
-                    show_equation = not show_equation
-        
-        # Update
-        if not paused and t <= 2 * math.pi:
-            x, y = heart_curve(t, scale)
-            turtle.move_to(x, y)
-            t += speed
-        
-        # Draw
+class HeartScene(Scene):
+    size = (WINDOW_WIDTH, WINDOW_HEIGHT)
+    caption = "Mathematical Heart Curve with Turtle"
+
+    def __init__(self):
+        self.t = 0  # Parameter for curve
+        self.step = 0  # Index of the next point in the sampled curve
+        self.clock = 0.0  # Samples due so far: advances with real time, not with frames
+        self.speed = 0.02  # How fast to draw
+        self.scale = 10  # Size of heart
+        self.turtle = Turtle(scale=self.scale, origin=HEART_ORIGIN)
+        self.paused = False
+        self.show_equation = True
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_SPACE:
+                self.paused = not self.paused
+            elif event.key == pygame.K_r:
+                # Reset
+                self.turtle.clear_trail()
+                self.t = 0
+                self.step = 0
+                self.clock = 0.0
+            elif event.key == pygame.K_UP:
+                self.scale = min(self.scale + 1, MAX_SCALE)
+                self.turtle.set_scale(self.scale)
+            elif event.key == pygame.K_DOWN:
+                self.scale = max(self.scale - 1, 3)
+                self.turtle.set_scale(self.scale)
+            elif event.key == pygame.K_e:
+                self.show_equation = not self.show_equation
+            elif event.key == pygame.K_m:
+                self.turtle.set_render_mode(next_render_mode(self.turtle.render_mode))
+            elif event.key == pygame.K_l:
+                self.turtle.set_unbounded(not isinstance(self.turtle.trail, DecimatedTrail))
+
+    def update(self, dt):
+        # The heart is sampled once in curve space; the turtle projects it at the current scale
+        points = CURVE_CACHE.get("heart_shape", heart_shape, HEART_RANGE, self.speed, 1)
+        if not self.paused and self.step < len(points):
+            # Draw every sample due by now: a late frame catches up in one batch
+            self.clock += min(dt, MAX_FRAME_TIME) * DRAW_RATE
+            target = min(int(self.clock + 1e-9), len(points))
+            if target > self.step:
+                self.turtle.move_along(points[self.step:target])
+                self.step = target
+                self.t = self.step * self.speed
+
+    def draw(self, screen):
         screen.fill(WHITE)
         
         # Draw turtle and trail
-        turtle.draw(screen)
+        self.turtle.draw(screen)
         
         # Draw instructions
         draw_text(screen, "Heart Curve Animation", 10, 10, 36, BLACK)
@@ -133,30 +225,37 @@ def main():
         draw_text(screen, "R - Reset", 10, 115, 20, BLACK)
         draw_text(screen, "UP/DOWN - Change size", 10, 140, 20, BLACK)
         draw_text(screen, "E - Toggle equation", 10, 165, 20, BLACK)
+        draw_text(screen, "M - Cycle render mode", 10, 190, 20, BLACK)
+        draw_text(screen, "L - Toggle full trail history", 10, 215, 20, BLACK)
         
         # Draw progress
-        progress = min(t / (2 * math.pi), 1.0) * 100
-        draw_text(screen, f"Progress: {progress:.1f}%", 10, 200, 24, BLACK)
-        draw_text(screen, f"Scale: {scale}", 10, 230, 24, BLACK)
+        progress = min(self.t / (2 * math.pi), 1.0) * 100
+        draw_text(screen, f"Progress: {progress:.1f}%", 10, 250, 24, BLACK)
+        draw_text(screen, f"Scale: {self.scale}", 10, 280, 24, BLACK)
+        mode = self.turtle.render_mode
+        history = "full" if isinstance(self.turtle.trail, DecimatedTrail) else "recent"
+        draw_text(screen, f"Render: {mode}, trail: {history} ({len(self.turtle.screen_trail)} points)",
+                  10, 310, 24, BLACK)
         
         # Show equation if enabled
-        if show_equation:
+        if self.show_equation:
             draw_text(screen, "Parametric Equations:", WINDOW_WIDTH - 400, 10, 24, BLACK)
             draw_text(screen, "x = 16 * sin^3(t)", WINDOW_WIDTH - 400, 40, 20, RED)
             draw_text(screen, "y = 13*cos(t) - 5*cos(2t) - 2*cos(3t) - cos(4t)", WINDOW_WIDTH - 400, 65, 20, RED)
             draw_text(screen, "t in [0, 2*pi]", WINDOW_WIDTH - 400, 90, 20, RED)
         
         # Show status
-        if paused:
+        if self.paused:
             draw_text(screen, "PAUSED", WINDOW_WIDTH // 2 - 50, 50, 36, RED)
-        elif t > 2 * math.pi:
+        elif self.t > 2 * math.pi:
             draw_text(screen, "COMPLETE! Press R to restart", WINDOW_WIDTH // 2 - 150, 50, 36, GREEN)
-        
-        pygame.display.flip()
-        clock.tick(60)
-    
-    pygame.quit()
+        return None
+
+def main():
+    runtime = GameRuntime(HeartScene.size, HeartScene.caption).start()
+    runtime.run(HeartScene())
+    runtime.close()
     sys.exit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,128 @@
+"""
+Single-process launcher for all the games.
+
+pygame is initialized once and one window and clock are shared. Every game is
+a Scene that is created the first time it is opened and then kept, together
+with its own off-screen surface at the game's native size, so switching back
+and forth is instant and the games' caches (sprites, fonts, trails) survive.
+
+Controls: F1-F4 switch games, ESC returns to the menu (1-4 also pick a game
+there). A paused game simply stops receiving update() calls.
+"""
+import sys
+
+import pygame
+
+import duck_game
+import heart_curve
+import math_curves
+import spaceship_assembly
+from game_runtime import GameRuntime, Scene
+
+WINDOW_WIDTH = 1600
+WINDOW_HEIGHT = 900
+BACKGROUND = (20, 20, 30)
+TEXT_COLOR = (255, 255, 255)
+HINT_COLOR = (160, 160, 180)
+
+SWITCH_KEYS = [pygame.K_F1, pygame.K_F2, pygame.K_F3, pygame.K_F4]
+MENU_KEYS = [pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4]
+
+
+class Launcher(Scene):
+    size = (WINDOW_WIDTH, WINDOW_HEIGHT)
+    caption = "YiranGame"
+
+    def __init__(self, runtime):
+        self.runtime = runtime
+        # (title, factory) in menu order; factories run the first time a game is opened
+        self.games = [
+            ("Duck Collection Game",
+             lambda: duck_game.DuckScene(collect_sound=duck_game.init_sound(runtime))),
+            ("Mathematical Heart Curve", heart_curve.HeartScene),
+            ("Mathematical Curves Explorer", math_curves.CurvesScene),
+            ("Spaceship Assembly Game", spaceship_assembly.SpaceshipGame),
+        ]
+        self.scenes = {}  # index -> scene, kept alive across switches
+        self.surfaces = {}  # index -> the scene's native-size surface
+        self.active = None  # None shows the menu
+        self.full_redraw = True  # the window still shows another game or the menu
+        self.font = pygame.font.Font(None, 36)
+        self.title_font = pygame.font.Font(None, 64)
+
+    def switch_to(self, index):
+        if index is not None and index not in self.scenes:
+            scene = self.games[index][1]()
+            scene.profiler = self.profiler
+            self.scenes[index] = scene
+            self.surfaces[index] = pygame.Surface(scene.size).convert()
+        self.active = index
+        self.full_redraw = True
+        title = self.caption if index is None else self.games[index][0]
+        pygame.display.set_caption(title)
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key in SWITCH_KEYS:
+                self.switch_to(SWITCH_KEYS.index(event.key))
+                return
+            if event.key == pygame.K_ESCAPE:
+                self.switch_to(None)
+                return
+            if self.active is None and event.key in MENU_KEYS:
+                self.switch_to(MENU_KEYS.index(event.key))
+                return
+        if self.active is not None:
+            self.scenes[self.active].handle_event(event)
+
+    def update(self, dt):
+        if self.active is not None:
+            self.scenes[self.active].update(dt)
+
+    def draw(self, screen):
+        if self.active is None:
+            screen.fill(BACKGROUND)
+            self.draw_menu(screen)
+            return None
+
+        # Scenes keep drawing at their native size; the surface is centered in the window.
+        # Scenes that return dirty rects only get those rects copied, moved to the window
+        surface = self.surfaces[self.active]
+        rects = self.scenes[self.active].draw(surface)
+        area = surface.get_rect(center=screen.get_rect().center)
+        if rects is None or self.full_redraw:
+            self.full_redraw = False
+            screen.fill(BACKGROUND)
+            screen.blit(surface, area)
+            return None
+        moved = []
+        for rect in rects:
+            rect = pygame.Rect(rect).clip(surface.get_rect())
+            if rect:
+                moved.append(screen.blit(surface, rect.move(area.topleft), rect))
+        return moved
+
+    def draw_menu(self, screen):
+        title = self.title_font.render("YiranGame", True, TEXT_COLOR)
+        screen.blit(title, title.get_rect(center=(WINDOW_WIDTH // 2, 200)))
+        for i, (name, _) in enumerate(self.games):
+            status = "  (running)" if i in self.scenes else ""
+            line = self.font.render(f"F{i + 1} / {i + 1}  -  {name}{status}", True, TEXT_COLOR)
+            screen.blit(line, (WINDOW_WIDTH // 2 - 250, 320 + i * 60))
+        hint = self.font.render("ESC returns to this menu from any game", True, HINT_COLOR)
+        screen.blit(hint, hint.get_rect(center=(WINDOW_WIDTH // 2, 620)))
+
+    def close(self):
+        for scene in self.scenes.values():
+            scene.close()
+
+
+def main():
+    runtime = GameRuntime((WINDOW_WIDTH, WINDOW_HEIGHT), Launcher.caption, sound=True).start()
+    runtime.run(Launcher(runtime))
+    runtime.close()
+    sys.exit()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,31 @@
+import argparse
 import pygame
 import math
 import sys
+import numpy as np
+from functools import partial
+from curve_cache import CURVE_CACHE, adaptive_times, sample_times
+from curve_prefetch import CurvePrefetcher
+from curve_registry import CurveRegistry
+from game_runtime import GameRuntime, Scene
+from trail_buffer import TrailBuffer
+from trail_lod import DecimatedTrail
+from trail_render import TRAIL_RENDERERS, TrailCanvas, next_render_mode
 
-# Initialize Pygame
-pygame.init()
-
-# Window settings
+# Window settings (the window itself is opened by main())
 WINDOW_WIDTH = 1200
 WINDOW_HEIGHT = 800
-screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-pygame.display.set_caption("Mathematical Curves Explorer")
+
+TRAIL_CAPACITY = 2000  # points kept in the explorer's trail
+DRAW_RATE = 60  # curve samples drawn per second of real time (one per frame at 60 FPS)
+MAX_FRAME_TIME = 0.25  # longest frame caught up at once (e.g. after the window was dragged)
+
+# Gallery mode
+GALLERY_TOP = 50  # room for the gallery header
+GALLERY_PADDING = 10  # inside each tile
+GALLERY_LABEL_HEIGHT = 18
+GALLERY_FADE_POINTS = 300
+GALLERY_HOLD_TIME = 2.0  # seconds the finished gallery stays up before starting over
 
 # Colors
 WHITE = (255, 255, 255)
@@ -20,14 +36,12 @@ BLACK = (0, 0, 0)
 PURPLE = (128, 0, 128)
 ORANGE = (255, 165, 0)
 
-# Clock
-clock = pygame.time.Clock()
-
 class CurveExplorer:
-    def __init__(self):
+    def __init__(self, trail_capacity=TRAIL_CAPACITY):
         self.curves = {
             '1': {
                 'name': 'Heart',
+                'key': 'builtin:Heart',  # sample cache key
                 'func': self.heart_curve,
                 'range': (0, 2 * math.pi),
                 'scale': 10,
@@ -35,6 +49,7 @@ class CurveExplorer:
             },
             '2': {
                 'name': 'Rose (4 petals)',
+                'key': 'builtin:Rose (4 petals)',  # sample cache key
                 'func': self.rose_curve,
                 'range': (0, 2 * math.pi),
                 'scale': 150,
@@ -42,6 +57,7 @@ class CurveExplorer:
             },
             '3': {
                 'name': 'Lissajous',
+                'key': 'builtin:Lissajous',  # sample cache key
                 'func': self.lissajous_curve,
                 'range': (0, 2 * math.pi),
                 'scale': 200,
@@ -49,6 +65,7 @@ class CurveExplorer:
             },
             '4': {
                 'name': 'Spiral',
+                'key': 'builtin:Spiral',  # sample cache key
                 'func': self.spiral_curve,
                 'range': (0, 8 * math.pi),
                 'scale': 5,
@@ -56,6 +73,7 @@ class CurveExplorer:
             },
             '5': {
                 'name': 'Infinity',
+                'key': 'builtin:Infinity',  # sample cache key
                 'func': self.infinity_curve,
                 'range': (0, 2 * math.pi),
                 'scale': 200,
@@ -64,136 +82,392 @@ class CurveExplorer:
         }
         
         self.current_curve = '1'
-        self.trail = []
-        self.t = 0
+        self.trail_capacity = trail_capacity
+        self.trail = TrailBuffer(trail_capacity)  # Oldest points drop off once full
+        self.canvas = None  # TrailCanvas when drawing incrementally
+        self.render_mode = "batched"  # one of trail_render.RENDER_MODES
+        self.step = 0  # Index of the next point in the sampled curve
+        self.clock = 0.0  # Samples due so far: advances with real time, not with frames
         self.speed = 0.02
+        self.adaptive = False  # sample by arc length and curvature instead of a fixed t step
+        self.prefetcher = CurvePrefetcher()  # samples the current curve in the background
         self.turtle_x = WINDOW_WIDTH // 2
         self.turtle_y = WINDOW_HEIGHT // 2
         
     def heart_curve(self, t, scale):
-        x = 16 * (math.sin(t) ** 3)
-        y = -(13 * math.cos(t) - 5 * math.cos(2*t) - 2 * math.cos(3*t) - math.cos(4*t))
+        x = 16 * (np.sin(t) ** 3)
+        y = -(13 * np.cos(t) - 5 * np.cos(2*t) - 2 * np.cos(3*t) - np.cos(4*t))
         return x * scale, y * scale
     
     def rose_curve(self, t, scale):
         # Rose curve with k=4 (4 petals)
-        r = math.cos(4 * t)
-        x = r * math.cos(t)
-        y = r * math.sin(t)
+        r = np.cos(4 * t)
+        x = r * np.cos(t)
+        y = r * np.sin(t)
         return x * scale, y * scale
     
     def lissajous_curve(self, t, scale):
         # Lissajous curve A=3, B=2
-        x = math.sin(3 * t)
-        y = math.sin(2 * t)
+        x = np.sin(3 * t)
+        y = np.sin(2 * t)
         return x * scale, y * scale
     
     def spiral_curve(self, t, scale):
         # Archimedean spiral
         r = t
-        x = r * math.cos(t)
-        y = r * math.sin(t)
+        x = r * np.cos(t)
+        y = r * np.sin(t)
         return x * scale, y * scale
     
     def infinity_curve(self, t, scale):
         # Figure-eight / Lemniscate approximation
-        x = math.cos(t)
-        y = math.sin(2 * t) / 2
+        x = np.cos(t)
+        y = np.sin(2 * t) / 2
         return x * scale, y * scale
     
-    def update(self, paused):
-        if not paused:
+    def sampled_points(self, key=None):
+        # The whole curve, sampled right away (once, then cached); the animation uses ready_points()
+        curve = self.curves[key or self.current_curve]
+        if self.adaptive:
+            return CURVE_CACHE.get_adaptive(curve['key'], curve['func'], curve['range'], curve['scale'])
+        return CURVE_CACHE.get(curve['key'], curve['func'], curve['range'], self.speed, curve['scale'])
+    
+    def sampling_job(self):
+        # Cache key of the current curve's samples, and the function computing its t values
+        curve = self.curves[self.current_curve]
+        if self.adaptive:
+            key = CURVE_CACHE.adaptive_key(curve['key'], curve['range'], curve['scale'])
+            return key, partial(adaptive_times, curve['func'], curve['range'], curve['scale'])
+        key = CURVE_CACHE.key(curve['key'], curve['range'], self.speed, curve['scale'])
+        return key, partial(sample_times, curve['range'], self.speed)
+    
+    def ready_points(self):
+        # All of the current curve once it is cached; until then, as much as the background
+        # sampler has delivered. Sampling starts over whenever the curve or the sampler changes.
+        key, times = self.sampling_job()
+        points = CURVE_CACHE.find(key)
+        if points is not None:
+            return points
+        prefetcher = self.prefetcher
+        if prefetcher.key != key:
             curve = self.curves[self.current_curve]
-            if self.t <= curve['range'][1]:
-                x, y = curve['func'](self.t, curve['scale'])
-                self.turtle_x = x + WINDOW_WIDTH // 2
-                self.turtle_y = y + WINDOW_HEIGHT // 2
-                self.trail.append((self.turtle_x, self.turtle_y))
-                self.t += self.speed
-                
-                # Limit trail length
-                if len(self.trail) > 2000:
-                    self.trail.pop(0)
+            prefetcher.start(key, times, curve['func'], curve['scale'])
+        points = prefetcher.poll()
+        if prefetcher.error is not None:
+            points = self.fallback_points(key, prefetcher.error)
+            prefetcher.stop()
+        elif prefetcher.done:
+            points = CURVE_CACHE.put(key, prefetcher.data)
+            prefetcher.stop()
+        return points
+    
+    def fallback_points(self, key, error):
+        # The background sampler failed: sample at the fixed t step right away, or draw nothing.
+        # The result is cached under the failed key too, so the failure is not retried every frame.
+        curve = self.curves[self.current_curve]
+        print(f"Warning: sampling {curve['name']} failed ({error}); using the fixed t step")
+        try:
+            points = CURVE_CACHE.get(curve['key'], curve['func'], curve['range'], self.speed, curve['scale'])
+        except Exception as error:
+            print(f"Warning: {curve['name']} cannot be sampled ({error})")
+            points = np.empty((0, 2))
+        return CURVE_CACHE.put(key, points)
+    
+    def point_count(self):
+        # Points in the whole current curve, or None while the sampler is still computing its t values
+        points = CURVE_CACHE.find(self.sampling_job()[0])
+        return len(points) if points is not None else self.prefetcher.count()
+    
+    def progress(self):
+        count = self.point_count()
+        return min(self.step / count, 1.0) if count else 0.0
+    
+    def update(self, dt, paused=False):
+        if not paused:
+            # Draw every sample due by now: a late frame catches up in one batch. The clock never runs
+            # ahead of the ready points, so a slow sampler pauses the turtle instead of making it jump.
+            points = self.ready_points()
+            self.clock = min(self.clock + min(dt, MAX_FRAME_TIME) * DRAW_RATE, len(points))
+            target = int(self.clock + 1e-9)
+            if target > self.step:
+                new_points = points[self.step:target] + (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2)
+                # Where the curve is undefined the turtle waits at its last finite point
+                finite = new_points[np.isfinite(new_points).all(axis=1)]
+                if len(finite):
+                    self.turtle_x, self.turtle_y = finite[-1]
+                self.trail.extend(new_points)
+                if self.canvas:
+                    self.canvas.add_points(new_points)
+                self.step = target
+    
+    def add_curves(self, curves):
+        # Append curves (e.g. a CurveRegistry) after the built-in ones, numbered on from them
+        for curve in curves:
+            self.curves[str(len(self.curves) + 1)] = curve
+    
+    def select(self, key):
+        self.current_curve = key
+        self.reset()
+    
+    def select_next(self, offset):
+        keys = list(self.curves)
+        self.select(keys[(keys.index(self.current_curve) + offset) % len(keys)])
     
     def reset(self):
         self.trail.clear()
-        self.t = 0
+        self.step = 0
+        self.clock = 0.0
+        if self.canvas:
+            self.canvas = self.make_canvas()
+    
+    def set_unbounded(self, unbounded):
+        # Full history: keep every point, simplifying older sections instead of dropping them
+        trail = DecimatedTrail() if unbounded else TrailBuffer(self.trail_capacity)
+        trail.extend(self.trail.view())
+        self.trail = trail
+    
+    def make_canvas(self):
+        # A segment fades from the curve color to black over about one full curve (estimated from
+        # the uniform step while the sampler has not counted the points yet)
+        curve = self.curves[self.current_curve]
+        fade_points = self.point_count() or len(sample_times(curve['range'], self.speed))
+        return TrailCanvas((WINDOW_WIDTH, WINDOW_HEIGHT), BLACK, curve['color'], 2, fade_points)
+    
+    def set_render_mode(self, mode):
+        self.render_mode = mode
+        self.set_incremental(mode == "incremental")
+    
+    def set_incremental(self, incremental):
+        # Incremental mode draws only the newest segment onto a persistent canvas
+        if incremental:
+            self.canvas = self.make_canvas()
+            self.canvas.rebuild(self.trail.view())
+        else:
+            self.canvas = None
     
     def draw(self, screen):
-        # Draw trail
-        if len(self.trail) > 1:
-            curve_color = self.curves[self.current_curve]['color']
-            for i in range(1, len(self.trail)):
-                alpha = i / len(self.trail)
-                color = tuple(int(c * alpha) for c in curve_color)
-                pygame.draw.line(screen, color, self.trail[i-1], self.trail[i], 2)
+        # Draw trail, fading in from black (oldest) to the curve color (newest)
+        if self.canvas:
+            self.canvas.draw(screen)
+        else:
+            render = TRAIL_RENDERERS[self.render_mode]
+            render(screen, self.trail.view(), BLACK, self.curves[self.current_curve]['color'], 2,
+                   rows=self.trail.rows)
         
         # Draw turtle
         pygame.draw.circle(screen, GREEN, (int(self.turtle_x), int(self.turtle_y)), 10)
         pygame.draw.circle(screen, BLACK, (int(self.turtle_x), int(self.turtle_y)), 10, 2)
 
+def fit_to_rect(points, rect):
+    # Scale and center an (n, 2) array of points into rect, keeping the aspect ratio;
+    # points that are not finite come back as None
+    finite = np.isfinite(points).all(axis=1)
+    low = points[finite].min(axis=0)
+    high = points[finite].max(axis=0)
+    span = np.maximum(high - low, 1e-9)
+    scale = min(rect.width / span[0], rect.height / span[1])
+    fitted = ((points - (low + high) / 2) * scale + rect.center).tolist()
+    return [point if ok else None for point, ok in zip(fitted, finite.tolist())]
+
+class CurveGallery:
+    # Every curve animating at once, one tile each. The tiles share the explorer's sample cache and
+    # one incremental canvas: a frame draws one new segment per tile, then blits the canvas once.
+    def __init__(self, explorer, area):
+        keys = list(explorer.curves)
+        columns = math.ceil(math.sqrt(len(keys) * area.width / area.height))
+        rows = math.ceil(len(keys) / columns)
+        tile_width = area.width // columns
+        tile_height = area.height // rows
+        font = pygame.font.Font(None, 20)
+        self.tiles = []  # (curve, tile rect, fitted points, rendered label)
+        for i, key in enumerate(keys):
+            curve = explorer.curves[key]
+            rect = pygame.Rect(area.x + (i % columns) * tile_width, area.y + (i // columns) * tile_height,
+                               tile_width, tile_height)
+            inner = rect.inflate(-2 * GALLERY_PADDING, -2 * GALLERY_PADDING)
+            inner.top += GALLERY_LABEL_HEIGHT
+            inner.height -= GALLERY_LABEL_HEIGHT
+            points = fit_to_rect(explorer.sampled_points(key), inner)
+            self.tiles.append((curve, rect, points, font.render(curve['name'], True, BLACK)))
+        self.canvas = TrailCanvas((WINDOW_WIDTH, WINDOW_HEIGHT), BLACK, BLACK, 2, GALLERY_FADE_POINTS)
+        self.reset()
+
+    def reset(self):
+        self.canvas.reset()
+        for curve, rect, points, label in self.tiles:
+            self.canvas.stamp(label, (rect.x + GALLERY_PADDING, rect.y + GALLERY_PADDING))
+        self.steps = [0] * len(self.tiles)
+        self.remaining = len(self.tiles)  # tiles still drawing
+        self.clock = 0.0  # samples due so far in every tile
+        self.hold = 0.0
+
+    def update(self, dt):
+        dt = min(dt, MAX_FRAME_TIME)
+        if self.remaining == 0:
+            self.hold += dt
+            if self.hold >= GALLERY_HOLD_TIME:
+                self.reset()
+            return
+        previous = int(self.clock + 1e-9)
+        self.clock += dt * DRAW_RATE
+        target = int(self.clock + 1e-9)
+        if target == previous:
+            return
+        canvas = self.canvas
+        fades = target // canvas.fade_every - previous // canvas.fade_every
+        if fades:
+            canvas.fade(fades)
+        steps = self.steps
+        for i, (curve, rect, points, label) in enumerate(self.tiles):
+            step = steps[i]
+            if step < len(points):
+                # A late frame draws every segment it missed
+                end = min(target, len(points))
+                for j in range(max(step, 1), end):
+                    if points[j - 1] and points[j]:
+                        canvas.add_segment(points[j - 1], points[j], curve['color'])
+                steps[i] = end
+                if end == len(points):
+                    self.remaining -= 1
+
+    def draw(self, screen):
+        self.canvas.draw(screen)
+        # A progress bar along the bottom of each tile
+        for (curve, rect, points, label), step in zip(self.tiles, self.steps):
+            width = (rect.width - 2 * GALLERY_PADDING) * step // len(points)
+            screen.fill(curve['color'], (rect.x + GALLERY_PADDING, rect.bottom - 4, width, 3))
+
 def draw_text(screen, text, x, y, size=24, color=BLACK):
     font = pygame.font.Font(None, size)
     text_surface = font.render(text, True, color)
     screen.blit(text_surface, (x, y))
 
-def main():
-    explorer = CurveExplorer()
-    paused = False
-    
-    running = True
-    while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
-                    paused = not paused
-                elif event.key == pygame.K_r:
+class CurvesScene(Scene):
+    size = (WINDOW_WIDTH, WINDOW_HEIGHT)
+    caption = "Mathematical Curves Explorer"
+
+    def __init__(self, curve_files=()):
+        self.explorer = CurveExplorer()
+        registry = CurveRegistry(curve['name'] for curve in self.explorer.curves.values())
+        for path in curve_files:
+            registry.load(path)
+        self.explorer.add_curves(registry)
+        self.paused = False
+        self.gallery = None  # CurveGallery while gallery mode is on
+
+    def make_gallery(self):
+        return CurveGallery(self.explorer, pygame.Rect(0, GALLERY_TOP, WINDOW_WIDTH, WINDOW_HEIGHT - GALLERY_TOP))
+
+    def handle_event(self, event):
+        explorer = self.explorer
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_SPACE:
+                self.paused = not self.paused
+            elif event.key == pygame.K_g:
+                self.gallery = None if self.gallery else self.make_gallery()
+            elif self.gallery:
+                # Gallery mode: restart, or restart with the other sampler
+                if event.key == pygame.K_r:
+                    self.gallery.reset()
+                elif event.key == pygame.K_a:
+                    explorer.adaptive = not explorer.adaptive
                     explorer.reset()
-                elif event.key in [pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4, pygame.K_5]:
-                    # Switch curves
-                    new_curve = chr(event.key)
-                    if new_curve in explorer.curves:
-                        explorer.current_curve = new_curve
-                        explorer.reset()
-        
-        # Update
-        explorer.update(paused)
-        
-        # Draw
+                    self.gallery = self.make_gallery()
+            elif event.key == pygame.K_r:
+                explorer.reset()
+            elif event.key == pygame.K_m:
+                explorer.set_render_mode(next_render_mode(explorer.render_mode))
+            elif event.key == pygame.K_l:
+                explorer.set_unbounded(not isinstance(explorer.trail, DecimatedTrail))
+            elif event.key == pygame.K_a:
+                # Switching sampler restarts the curve: the point indices no longer line up
+                explorer.adaptive = not explorer.adaptive
+                explorer.reset()
+            elif pygame.K_1 <= event.key <= pygame.K_9:
+                # Switch curves
+                new_curve = chr(event.key)
+                if new_curve in explorer.curves:
+                    explorer.select(new_curve)
+            elif event.key == pygame.K_LEFT:
+                explorer.select_next(-1)
+            elif event.key == pygame.K_RIGHT:
+                explorer.select_next(1)
+
+    def update(self, dt):
+        if self.gallery:
+            if not self.paused:
+                self.gallery.update(dt)
+        else:
+            self.explorer.update(dt, self.paused)
+
+    def draw(self, screen):
+        explorer = self.explorer
         screen.fill(WHITE)
+        if self.gallery:
+            self.gallery.draw(screen)
+            sampling = "adaptive" if explorer.adaptive else "uniform"
+            draw_text(screen, f"Gallery: {len(explorer.curves)} curves ({sampling} sampling)", 10, 10, 36, BLACK)
+            draw_text(screen, "G - Back   SPACE - Pause   R - Restart   A - Toggle sampling",
+                      WINDOW_WIDTH - 520, 18, 20, BLACK)
+            if self.paused:
+                draw_text(screen, "PAUSED", WINDOW_WIDTH // 2 - 50, 10, 36, RED)
+            return None
         explorer.draw(screen)
         
         # UI
         current = explorer.curves[explorer.current_curve]
         draw_text(screen, f"Current: {current['name']}", 10, 10, 36, BLACK)
+        if 'equation' in current:
+            draw_text(screen, current['equation'], 10, 38, 20, current['color'])
         
         draw_text(screen, "Select Curve:", 10, 60, 24, BLACK)
         y_offset = 90
-        for key, curve in explorer.curves.items():
+        # Loaded curve files can hold hundreds of curves: list the five around the current one
+        keys = list(explorer.curves)
+        first = max(0, min(keys.index(explorer.current_curve) - 2, len(keys) - 5))
+        for key in keys[first:first + 5]:
+            curve = explorer.curves[key]
             color = BLACK if key != explorer.current_curve else curve['color']
             draw_text(screen, f"{key} - {curve['name']}", 10, y_offset, 20, color)
             y_offset += 25
         
         draw_text(screen, "Controls:", 10, 250, 24, BLACK)
-        draw_text(screen, "1-5 - Select curve", 10, 280, 20, BLACK)
-        draw_text(screen, "SPACE - Pause/Resume", 10, 305, 20, BLACK)
-        draw_text(screen, "R - Reset", 10, 330, 20, BLACK)
+        draw_text(screen, "1-9 - Select curve", 10, 280, 20, BLACK)
+        draw_text(screen, "LEFT/RIGHT - Previous/next curve", 10, 305, 20, BLACK)
+        draw_text(screen, "SPACE - Pause/Resume", 10, 330, 20, BLACK)
+        draw_text(screen, "R - Reset", 10, 355, 20, BLACK)
+        draw_text(screen, "M - Cycle render mode", 10, 380, 20, BLACK)
+        draw_text(screen, "A - Toggle adaptive sampling", 10, 405, 20, BLACK)
+        draw_text(screen, "G - Gallery of all curves", 10, 430, 20, BLACK)
+        draw_text(screen, "L - Toggle full trail history", 10, 455, 20, BLACK)
         
         # Progress
-        curve_range = current['range']
-        progress = min((explorer.t - curve_range[0]) / (curve_range[1] - curve_range[0]), 1.0) * 100
-        draw_text(screen, f"Progress: {progress:.1f}%", 10, 370, 24, BLACK)
+        draw_text(screen, f"Progress: {explorer.progress() * 100:.1f}%", 10, 495, 24, BLACK)
+        mode = explorer.render_mode
+        sampling = "adaptive" if explorer.adaptive else "uniform"
+        draw_text(screen, f"Render: {mode}, sampling: {sampling}", 10, 525, 24, BLACK)
+        history = "full" if isinstance(explorer.trail, DecimatedTrail) else "recent"
+        draw_text(screen, f"Trail: {history} ({len(explorer.trail)} points)", 10, 555, 24, BLACK)
+        if explorer.prefetcher.key is not None:
+            draw_text(screen, f"Sampling in the background: {len(explorer.prefetcher.points())} points ready",
+                      10, 585, 20, BLACK)
         
-        if paused:
+        if self.paused:
             draw_text(screen, "PAUSED", WINDOW_WIDTH // 2 - 50, 50, 36, RED)
-        
-        pygame.display.flip()
-        clock.tick(60)
-    
-    pygame.quit()
+        return None
+
+    def close(self):
+        self.explorer.prefetcher.stop()
+
+def main(curve_files=()):
+    runtime = GameRuntime(CurvesScene.size, CurvesScene.caption).start()
+    runtime.run(CurvesScene(curve_files))
+    runtime.close()
     sys.exit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Mathematical Curves Explorer")
+    parser.add_argument("--curves", nargs="+", default=[], metavar="PATH",
+                        help="JSON files of extra curves to load, e.g. curves/examples.json")
+    args = parser.parse_args()
+    main(args.curves)
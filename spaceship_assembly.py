@@ -1,15 +1,11 @@
 import pygame
 import math
 import sys
+from game_runtime import GameRuntime, Scene
 
-# Initialize Pygame
-pygame.init()
-
-# Window settings
+# Window settings (the window itself is opened by main())
 WINDOW_WIDTH = 1400
 WINDOW_HEIGHT = 900
-screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-pygame.display.set_caption("Spaceship Assembly Game")
 
 # Colors
 WHITE = (255, 255, 255)
@@ -25,8 +21,9 @@ SILVER = (192, 192, 192)
 DARK_BLUE = (0, 0, 139)
 SPACE_BLACK = (10, 10, 30)
 
-# Clock
-clock = pygame.time.Clock()
+# Animation timing: update() advances the animations in fixed steps, however often the game is drawn
+STEP_RATE = 60  # animation steps per second of real time (one per frame at 60 FPS)
+MAX_FRAME_TIME = 0.25  # longest frame caught up at once (e.g. after the window was dragged)
 
 # Game states
 COMPONENT_INTRO = "intro"
@@ -60,56 +57,102 @@ class SpaceshipComponent:
             return True
     
     def draw(self, screen):
-        x, y = int(self.position[0]), int(self.position[1])
-        
-        if self.name == "Command Module":
-            # Command module - rounded rectangle
-            pygame.draw.ellipse(screen, self.color, (x-40, y-20, 80, 40))
-            pygame.draw.circle(screen, BLUE, (x, y-5), 8)  # Window
-            
-        elif self.name == "Main Engine":
-            # Main engine - cone shape
-            points = [(x-30, y+20), (x+30, y+20), (x+15, y-20), (x-15, y-20)]
-            pygame.draw.polygon(screen, self.color, points)
-            # Engine flames when assembled
-            if self.is_assembled:
-                flame_points = [(x-15, y+20), (x+15, y+20), (x, y+40)]
-                pygame.draw.polygon(screen, ORANGE, flame_points)
-                
-        elif self.name == "Fuel Tank":
-            # Fuel tank - cylindrical
-            pygame.draw.rect(screen, self.color, (x-25, y-30, 50, 60))
-            pygame.draw.ellipse(screen, self.color, (x-25, y-35, 50, 10))
-            pygame.draw.ellipse(screen, self.color, (x-25, y+25, 50, 10))
-            
-        elif self.name == "Solar Panels":
-            # Solar panels - rectangular with grid
-            pygame.draw.rect(screen, self.color, (x-60, y-15, 120, 30))
-            # Draw grid pattern
-            for i in range(0, 120, 20):
-                pygame.draw.line(screen, BLACK, (x-60+i, y-15), (x-60+i, y+15), 1)
-            for i in range(0, 30, 10):
-                pygame.draw.line(screen, BLACK, (x-60, y-15+i), (x+60, y-15+i), 1)
-                
-        elif self.name == "Communication Antenna":
-            # Communication antenna
-            pygame.draw.rect(screen, self.color, (x-5, y-20, 10, 40))
-            pygame.draw.circle(screen, self.color, (x, y-25), 8)
-            # Antenna lines
-            for angle in range(0, 360, 45):
-                end_x = x + 15 * math.cos(math.radians(angle))
-                end_y = y - 25 + 15 * math.sin(math.radians(angle))
-                pygame.draw.line(screen, self.color, (x, y-25), (end_x, end_y), 2)
-                
-        elif self.name == "Landing Module":
-            # Landing module
-            pygame.draw.rect(screen, self.color, (x-20, y-15, 40, 30))
-            # Landing legs
-            pygame.draw.line(screen, BLACK, (x-20, y+15), (x-30, y+25), 3)
-            pygame.draw.line(screen, BLACK, (x+20, y+15), (x+30, y+25), 3)
-            pygame.draw.line(screen, BLACK, (x, y+15), (x, y+25), 3)
+        sprite, (dx, dy) = get_component_sprite(self.name, self.color, self.is_assembled)
+        return screen.blit(sprite, (int(self.position[0]) + dx, int(self.position[1]) + dy))
+
+# Each component type is drawn once into a cached sprite; drawing a component is then one blit
+SPRITE_COLORKEY = (255, 0, 255)
+SPRITE_CANVAS = (160, 120)  # big enough for every component, centered on the component position
+_component_sprites = {}
+
+def paint_command_module(surface, x, y, color, assembled):
+    # Command module - rounded rectangle
+    pygame.draw.ellipse(surface, color, (x-40, y-20, 80, 40))
+    pygame.draw.circle(surface, BLUE, (x, y-5), 8)  # Window
+
+def paint_main_engine(surface, x, y, color, assembled):
+    # Main engine - cone shape
+    points = [(x-30, y+20), (x+30, y+20), (x+15, y-20), (x-15, y-20)]
+    pygame.draw.polygon(surface, color, points)
+    # Engine flames when assembled
+    if assembled:
+        flame_points = [(x-15, y+20), (x+15, y+20), (x, y+40)]
+        pygame.draw.polygon(surface, ORANGE, flame_points)
+
+def paint_fuel_tank(surface, x, y, color, assembled):
+    # Fuel tank - cylindrical
+    pygame.draw.rect(surface, color, (x-25, y-30, 50, 60))
+    pygame.draw.ellipse(surface, color, (x-25, y-35, 50, 10))
+    pygame.draw.ellipse(surface, color, (x-25, y+25, 50, 10))
+
+def paint_solar_panels(surface, x, y, color, assembled):
+    # Solar panels - rectangular with grid
+    pygame.draw.rect(surface, color, (x-60, y-15, 120, 30))
+    # Draw grid pattern
+    for i in range(0, 120, 20):
+        pygame.draw.line(surface, BLACK, (x-60+i, y-15), (x-60+i, y+15), 1)
+    for i in range(0, 30, 10):
+        pygame.draw.line(surface, BLACK, (x-60, y-15+i), (x+60, y-15+i), 1)
+
+def paint_antenna(surface, x, y, color, assembled):
+    # Communication antenna
+    pygame.draw.rect(surface, color, (x-5, y-20, 10, 40))
+    pygame.draw.circle(surface, color, (x, y-25), 8)
+    # Antenna lines
+    for angle in range(0, 360, 45):
+        end_x = x + 15 * math.cos(math.radians(angle))
+        end_y = y - 25 + 15 * math.sin(math.radians(angle))
+        pygame.draw.line(surface, color, (x, y-25), (end_x, end_y), 2)
+
+def paint_landing_module(surface, x, y, color, assembled):
+    # Landing module
+    pygame.draw.rect(surface, color, (x-20, y-15, 40, 30))
+    # Landing legs
+    pygame.draw.line(surface, BLACK, (x-20, y+15), (x-30, y+25), 3)
+    pygame.draw.line(surface, BLACK, (x+20, y+15), (x+30, y+25), 3)
+    pygame.draw.line(surface, BLACK, (x, y+15), (x, y+25), 3)
+
+COMPONENT_PAINTERS = {
+    "Command Module": paint_command_module,
+    "Main Engine": paint_main_engine,
+    "Fuel Tank": paint_fuel_tank,
+    "Solar Panels": paint_solar_panels,
+    "Communication Antenna": paint_antenna,
+    "Landing Module": paint_landing_module,
+}
+ASSEMBLED_VARIANTS = {"Main Engine"}  # component types that look different once assembled
+
+def get_component_sprite(name, color, assembled=False):
+    # Returns (sprite, offset of its top-left corner from the component position)
+    key = (name, color, assembled and name in ASSEMBLED_VARIANTS)
+    entry = _component_sprites.get(key)
+    if entry is None:
+        canvas = pygame.Surface(SPRITE_CANVAS)
+        canvas.fill(SPRITE_COLORKEY)
+        canvas.set_colorkey(SPRITE_COLORKEY)
+        center_x, center_y = SPRITE_CANVAS[0] // 2, SPRITE_CANVAS[1] // 2
+        COMPONENT_PAINTERS[name](canvas, center_x, center_y, color, key[2])
+        # Crop to the painted pixels so the blit touches as little of the screen as possible
+        bounds = canvas.get_bounding_rect()
+        sprite = canvas.subsurface(bounds).copy()
+        sprite.set_colorkey(SPRITE_COLORKEY, pygame.RLEACCEL)
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert()
+        entry = _component_sprites[key] = (sprite, (bounds.x - center_x, bounds.y - center_y))
+    return entry
+
+def draw_components(screen, components):
+    # A whole ship in one Surface.blits call
+    blits = []
+    for component in components:
+        sprite, (dx, dy) = get_component_sprite(component.name, component.color, component.is_assembled)
+        blits.append((sprite, (int(component.position[0]) + dx, int(component.position[1]) + dy)))
+    return screen.blits(blits)
+
+class SpaceshipGame(Scene):
+    size = (WINDOW_WIDTH, WINDOW_HEIGHT)
+    caption = "Spaceship Assembly Game"
 
-class SpaceshipGame:
     def __init__(self):
         self.state = COMPONENT_INTRO
         self.current_component_index = 0
@@ -118,6 +161,7 @@ class SpaceshipGame:
         self.assembly_complete = False
         self.spaceship_y = WINDOW_HEIGHT // 2
         self.stars = self.generate_stars()
+        self.clock = 0.0  # animation steps due but not yet taken
         
         # Define spaceship components
         self.components = [
@@ -152,75 +196,49 @@ class SpaceshipGame:
             stars.append((x, y, brightness))
         return stars
     
-    def draw_text(self, text, x, y, size=24, color=BLACK):
+    def draw_text(self, screen, text, x, y, size=24, color=BLACK):
         font = pygame.font.Font(None, size)
         text_surface = font.render(text, True, color)
         screen.blit(text_surface, (x, y))
     
-    def draw_intro_phase(self):
+    def draw_intro_phase(self, screen):
         screen.fill(WHITE)
         
         # Draw title
-        self.draw_text("Spaceship Components Introduction", WINDOW_WIDTH // 2 - 250, 50, 48, BLACK)
+        self.draw_text(screen, "Spaceship Components Introduction", WINDOW_WIDTH // 2 - 250, 50, 48, BLACK)
         
         if self.current_component_index < len(self.components):
             component = self.components[self.current_component_index]
             
-            # Draw component in center
-            component.position = (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2)
+            # Draw component in center (placed there by update())
             component.draw(screen)
             
             # Draw component info
-            self.draw_text(f"Component {self.current_component_index + 1}: {component.name}", 
+            self.draw_text(screen, f"Component {self.current_component_index + 1}: {component.name}", 
                           50, 150, 36, BLACK)
-            self.draw_text(f"Function: {component.description}", 
+            self.draw_text(screen, f"Function: {component.description}", 
                           50, 200, 24, BLACK)
             
             # Draw progress
             progress = (self.current_component_index + 1) / len(self.components) * 100
-            self.draw_text(f"Progress: {progress:.0f}%", 50, 250, 24, BLACK)
+            self.draw_text(screen, f"Progress: {progress:.0f}%", 50, 250, 24, BLACK)
             
             # Instructions
-            self.draw_text("Press SPACE to continue to next component", 50, WINDOW_HEIGHT - 100, 24, BLUE)
-            self.draw_text("Press A to start assembly", 50, WINDOW_HEIGHT - 70, 24, GREEN)
+            self.draw_text(screen, "Press SPACE to continue to next component", 50, WINDOW_HEIGHT - 100, 24, BLUE)
+            self.draw_text(screen, "Press A to start assembly", 50, WINDOW_HEIGHT - 70, 24, GREEN)
         
-    def draw_assembly_phase(self):
+    def draw_assembly_phase(self, screen):
         screen.fill(WHITE)
         
         # Draw title
-        self.draw_text("Spaceship Assembly in Progress...", WINDOW_WIDTH // 2 - 200, 50, 36, BLACK)
-        
-        # Update component positions - one at a time in assembly order
-        if self.current_assembly_component < len(self.assembly_order):
-            current_idx = self.assembly_order[self.current_assembly_component]
-            current_comp = self.components[current_idx]
-            
-            # Move current component
-            if current_comp.move_to_target(speed=3):
-                current_comp.is_assembled = True
-                self.current_assembly_component += 1
-                
-                # Add a delay effect by resetting position slightly
-                if self.current_assembly_component < len(self.assembly_order):
-                    next_idx = self.assembly_order[self.current_assembly_component]
-                    next_comp = self.components[next_idx]
-                    # Make the next component start from further away for dramatic effect
-                    if next_comp.position[0] < WINDOW_WIDTH // 2:
-                        next_comp.position = (50, next_comp.position[1])
-                    else:
-                        next_comp.position = (WINDOW_WIDTH - 50, next_comp.position[1])
-        
-        # Check if all assembled
-        if self.current_assembly_component >= len(self.components):
-            self.assembly_complete = True
+        self.draw_text(screen, "Spaceship Assembly in Progress...", WINDOW_WIDTH // 2 - 200, 50, 36, BLACK)
         
         # Draw all components
+        draw_components(screen, self.components)
         for i, component in enumerate(self.components):
-            component.draw(screen)
-            
             # Draw component status
             if component.is_assembled:
-                self.draw_text("✓", int(component.position[0]) + 70, int(component.position[1]) - 10, 24, GREEN)
+                self.draw_text(screen, "✓", int(component.position[0]) + 70, int(component.position[1]) - 10, 24, GREEN)
             elif self.current_assembly_component < len(self.assembly_order) and i == self.assembly_order[self.current_assembly_component]:
                 # Highlight current component being assembled
                 pygame.draw.circle(screen, ORANGE, (int(component.position[0]), int(component.position[1])), 
@@ -229,55 +247,43 @@ class SpaceshipGame:
         # Draw assembly progress
         assembled_count = sum(1 for c in self.components if c.is_assembled)
         progress = assembled_count / len(self.components) * 100
-        self.draw_text(f"Assembly Progress: {progress:.0f}%", 50, 150, 32, BLACK)
+        self.draw_text(screen, f"Assembly Progress: {progress:.0f}%", 50, 150, 32, BLACK)
         
         # Show current component being assembled
         if self.current_assembly_component < len(self.assembly_order):
             current_idx = self.assembly_order[self.current_assembly_component]
             current_name = self.components[current_idx].name
-            self.draw_text(f"Installing: {current_name}", 50, 200, 28, ORANGE)
+            self.draw_text(screen, f"Installing: {current_name}", 50, 200, 28, ORANGE)
         
         # Draw component list with status in assembly order
         y_offset = 250
-        self.draw_text("Assembly Sequence:", 50, y_offset - 30, 24, BLACK)
+        self.draw_text(screen, "Assembly Sequence:", 50, y_offset - 30, 24, BLACK)
         for idx in self.assembly_order:
             comp = self.components[idx]
             is_current = self.current_assembly_component < len(self.assembly_order) and idx == self.assembly_order[self.current_assembly_component]
             color = GREEN if comp.is_assembled else (ORANGE if is_current else BLACK)
             status = "✓ Installed" if comp.is_assembled else ("→ Installing..." if is_current else "⋯ Waiting")
-            self.draw_text(f"{status} {comp.name}", 50, y_offset, 20, color)
+            self.draw_text(screen, f"{status} {comp.name}", 50, y_offset, 20, color)
             y_offset += 30
         
         # Instructions
         if self.assembly_complete:
-            self.draw_text("Assembly Complete! Press L to launch rocket", 50, WINDOW_HEIGHT - 70, 24, GREEN)
+            self.draw_text(screen, "Assembly Complete! Press L to launch rocket", 50, WINDOW_HEIGHT - 70, 24, GREEN)
         else:
-            self.draw_text("Components are assembling one by one...", 50, WINDOW_HEIGHT - 70, 24, BLUE)
+            self.draw_text(screen, "Components are assembling one by one...", 50, WINDOW_HEIGHT - 70, 24, BLUE)
     
-    def draw_launch_phase(self):
+    def draw_launch_phase(self, screen):
         # Space background with moving stars
         screen.fill(SPACE_BLACK)
         
         # Draw moving stars
-        for i, (x, y, brightness) in enumerate(self.stars):
-            new_y = (y + 2) % WINDOW_HEIGHT
-            self.stars[i] = (x, new_y, brightness)
+        for x, y, brightness in self.stars:
             color = (brightness, brightness, brightness)
-            pygame.draw.circle(screen, color, (x, new_y), 1)
-        
-        # Move spaceship up
-        self.spaceship_y -= 3
-        if self.spaceship_y < -200:
-            self.spaceship_y = WINDOW_HEIGHT + 200
+            pygame.draw.circle(screen, color, (x, y), 1)
         
         # Draw assembled spaceship
         center_x = WINDOW_WIDTH // 2
-        for component in self.components:
-            component.position = (
-                center_x + (component.target_position[0] - WINDOW_WIDTH // 2),
-                self.spaceship_y + (component.target_position[1] - WINDOW_HEIGHT // 2)
-            )
-            component.draw(screen)
+        draw_components(screen, self.components)
         
         # Draw launch effects
         flame_y = self.spaceship_y + 80
@@ -291,9 +297,9 @@ class SpaceshipGame:
             pygame.draw.polygon(screen, colors[i % 3], flame_points)
         
         # Draw title and info
-        self.draw_text("Flying to Space!", WINDOW_WIDTH // 2 - 120, 50, 36, WHITE)
-        self.draw_text("Mission Success! Spaceship is heading to space", WINDOW_WIDTH // 2 - 250, 100, 24, WHITE)
-        self.draw_text("Press R to restart", 50, WINDOW_HEIGHT - 50, 24, WHITE)
+        self.draw_text(screen, "Flying to Space!", WINDOW_WIDTH // 2 - 120, 50, 36, WHITE)
+        self.draw_text(screen, "Mission Success! Spaceship is heading to space", WINDOW_WIDTH // 2 - 250, 100, 24, WHITE)
+        self.draw_text(screen, "Press R to restart", 50, WINDOW_HEIGHT - 50, 24, WHITE)
     
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN:
@@ -314,36 +320,77 @@ class SpaceshipGame:
                 if event.key == pygame.K_r:
                     self.__init__()  # Restart game
     
-    def update(self):
-        pass
+    def update(self, dt):
+        # Animations advance in fixed steps at STEP_RATE; the draw_* methods only draw
+        if self.state == COMPONENT_INTRO:
+            if self.current_component_index < len(self.components):
+                self.components[self.current_component_index].position = (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2)
+            return
+        self.clock += min(dt, MAX_FRAME_TIME) * STEP_RATE
+        steps = int(self.clock + 1e-9)
+        self.clock -= steps
+        for _ in range(steps):
+            if self.state == ASSEMBLY:
+                self.step_assembly()
+            elif self.state == LAUNCH:
+                self.step_launch()
+    
+    def step_assembly(self):
+        # Update component positions - one at a time in assembly order
+        if self.current_assembly_component < len(self.assembly_order):
+            current_idx = self.assembly_order[self.current_assembly_component]
+            current_comp = self.components[current_idx]
+            
+            # Move current component
+            if current_comp.move_to_target(speed=3):
+                current_comp.is_assembled = True
+                self.current_assembly_component += 1
+                
+                # Add a delay effect by resetting position slightly
+                if self.current_assembly_component < len(self.assembly_order):
+                    next_idx = self.assembly_order[self.current_assembly_component]
+                    next_comp = self.components[next_idx]
+                    # Make the next component start from further away for dramatic effect
+                    if next_comp.position[0] < WINDOW_WIDTH // 2:
+                        next_comp.position = (50, next_comp.position[1])
+                    else:
+                        next_comp.position = (WINDOW_WIDTH - 50, next_comp.position[1])
+        
+        # Check if all assembled
+        if self.current_assembly_component >= len(self.components):
+            self.assembly_complete = True
+    
+    def step_launch(self):
+        # Move stars down
+        for i, (x, y, brightness) in enumerate(self.stars):
+            self.stars[i] = (x, (y + 2) % WINDOW_HEIGHT, brightness)
+        
+        # Move spaceship up
+        self.spaceship_y -= 3
+        if self.spaceship_y < -200:
+            self.spaceship_y = WINDOW_HEIGHT + 200
+        
+        # Keep the assembled spaceship together
+        center_x = WINDOW_WIDTH // 2
+        for component in self.components:
+            component.position = (
+                center_x + (component.target_position[0] - WINDOW_WIDTH // 2),
+                self.spaceship_y + (component.target_position[1] - WINDOW_HEIGHT // 2)
+            )
     
-    def draw(self):
+    def draw(self, screen):
         if self.state == COMPONENT_INTRO:
-            self.draw_intro_phase()
+            self.draw_intro_phase(screen)
         elif self.state == ASSEMBLY:
-            self.draw_assembly_phase()
+            self.draw_assembly_phase(screen)
         elif self.state == LAUNCH:
-            self.draw_launch_phase()
+            self.draw_launch_phase(screen)
 
 def main():
-    game = SpaceshipGame()
-    
-    running = True
-    while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            else:
-                game.handle_event(event)
-        
-        game.update()
-        game.draw()
-        
-        pygame.display.flip()
-        clock.tick(60)
-    
-    pygame.quit()
+    runtime = GameRuntime(SpaceshipGame.size, SpaceshipGame.caption).start()
+    runtime.run(SpaceshipGame())
+    runtime.close()
     sys.exit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,28 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from curve_cache import FALLBACK_STEP, adaptive_times, sample_times
+
+
+def test_adaptive_times_skip_non_finite_stretches():
+    # sqrt(t - 3) is NaN for t < 3: samples only where the curve exists, plus the range ends
+    def curve(t, scale):
+        with np.errstate(invalid="ignore"):
+            return np.sqrt(t - 3) * scale, t * scale
+
+    times = adaptive_times(curve, (0, 6), 50)
+    assert times[-1] == 6
+    assert np.all(np.diff(times) > 0)
+    assert np.sum(times < 2.9) <= 1
+
+
+def test_adaptive_times_fall_back_to_a_fixed_step():
+    def curve(t, scale):
+        return np.full_like(t, np.nan), np.full_like(t, np.inf)
+
+    times = adaptive_times(curve, (0, 1), 100)
+    assert np.array_equal(times, sample_times((0, 1), FALLBACK_STEP))
@@ -0,0 +1,53 @@
+import json
+import os
+import sys
+import xml.etree.ElementTree as ElementTree
+
+import numpy as np
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from curve_export import build_catalog, export_curve, fit_points, unique_filenames
+from curve_registry import CurveRegistry
+
+
+def test_svg_title_is_escaped(tmp_path):
+    curve = CurveRegistry().add('<Rose> & "friends"', "cos(t)", "sin(t)")
+    path = str(tmp_path / "rose.svg")
+    export_curve(curve, path, (200, 200))
+    root = ElementTree.parse(path).getroot()
+    assert root.find("{http://www.w3.org/2000/svg}title").text == '<Rose> & "friends"'
+
+
+def test_partly_undefined_curves_export(tmp_path):
+    curve = CurveRegistry().add("Half", "sqrt(t-3)", "t")
+    for name in ("half.svg", "half.png"):
+        export_curve(curve, str(tmp_path / name), (200, 200))
+    assert ElementTree.parse(str(tmp_path / "half.svg")).getroot().find("{http://www.w3.org/2000/svg}polyline") is not None
+
+
+def test_colliding_slugs_get_distinct_filenames():
+    assert unique_filenames(["Rose 1", "rose-1", "ROSE_1", "Spiral"], "svg") == [
+        "rose_1.svg", "rose_1_2.svg", "rose_1_3.svg", "spiral.svg"]
+
+
+def test_loaded_curves_cannot_shadow_built_ins(tmp_path):
+    path = tmp_path / "curves.json"
+    path.write_text(json.dumps({"curves": [{"name": "Spiral", "x": "t", "y": "t"}]}))
+    with pytest.raises(ValueError):
+        build_catalog([str(path)])
+    registry = CurveRegistry()
+    registry.add("Twice", "t", "t")
+    with pytest.raises(ValueError):
+        registry.add("Twice", "t", "2t")
+
+
+def test_infinite_points_are_left_out_of_the_fit():
+    curve = CurveRegistry().add("Hyper", "cos(t)/t", "sin(t)/t", (0, 10))
+    points = fit_points(curve, (800, 800))
+    finite = points[np.isfinite(points).all(axis=1)]
+    assert len(finite) > 100
+    assert finite.min() >= 0 and finite.max() <= 800
+    assert np.ptp(finite[:, 0]) > 600 or np.ptp(finite[:, 1]) > 600
@@ -0,0 +1,38 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from curve_prefetch import CurvePrefetcher
+
+
+def poll_until(prefetcher, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not prefetcher.done and prefetcher.error is None and time.monotonic() < deadline:
+        prefetcher.poll()
+        time.sleep(0.001)
+
+
+def test_samples_every_chunk():
+    prefetcher = CurvePrefetcher(chunk=7)
+    prefetcher.start("line", lambda: np.arange(100.0), lambda t, scale: (t * scale, t), 2.0)
+    poll_until(prefetcher)
+    assert prefetcher.done
+    assert np.array_equal(prefetcher.points()[:, 0], np.arange(100.0) * 2)
+
+
+def test_worker_errors_are_stored_not_raised():
+    def kernel(t, scale):
+        if t[0] >= 10:
+            raise RuntimeError("boom")
+        return t, t
+
+    prefetcher = CurvePrefetcher(chunk=10)
+    prefetcher.start("bad", lambda: np.arange(100.0), kernel, 1.0)
+    poll_until(prefetcher)
+    assert isinstance(prefetcher.error, RuntimeError)
+    assert prefetcher.key == "bad" and not prefetcher.done
+    assert len(prefetcher.poll()) == 10  # the points sampled before the error stay readable
@@ -0,0 +1,58 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from curve_registry import CurveRegistry, compile_kernel, evaluate_constant, normalize
+
+
+@pytest.mark.parametrize("source, expected", [
+    ("1e-3", 0.001),
+    ("2.5e2*t", 250.0),
+    ("1.5E+2 t", 150.0),
+    ("2e", 2 * np.e),  # no exponent digits: 2 times the constant e
+    ("3t", 3.0),
+])
+def test_exponent_literals_are_numbers(source, expected):
+    x, _ = compile_kernel(source, "t")(np.array([1.0]), 1.0)
+    assert x[0] == pytest.approx(expected)
+
+
+def test_implicit_multiplication():
+    assert normalize("2sin(t)") == "2*sin(t)"
+    assert normalize("(t)(t)") == "(t)*(t)"
+    assert normalize("(t)2") == "(t)*2"
+    assert normalize("1e-3t^2") == "1e-3*t**2"
+    assert normalize("2 3") == "2*3"
+    assert normalize("pi t") == "pi*t"
+    assert normalize("t 2 sin(t)") == "t*2*sin(t)"
+    assert normalize("t(t + 1)") == "t*(t+1)"
+    x, y = compile_kernel("2 3", "pi t")(np.array([2.0]), 1.0)
+    assert x[0] == 6.0 and y[0] == 2 * np.pi
+
+
+def test_function_names_must_be_called():
+    for source in ("sin t", "2 cos 3"):
+        with pytest.raises(ValueError, match="must be followed by"):
+            normalize(source)
+
+
+def test_overflow_and_division_by_zero_give_inf():
+    for source in ("1e308^2", "9^9^9", "pi/0"):
+        x, _ = compile_kernel(source, "t")(np.array([1.0]), 1.0)
+        assert np.isinf(x[0])
+
+
+def test_curves_without_finite_points_are_rejected():
+    registry = CurveRegistry()
+    for x in ("pi/0", "log(0-t-1)", "9^9^9"):
+        with pytest.raises(ValueError):
+            registry.add("Broken", x, "t")
+    with pytest.raises(ValueError):
+        evaluate_constant("1/0")
+    # Partly finite curves are kept
+    registry.add("Half", "sqrt(t-3)", "t")
+    assert len(registry) == 1
@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import duck_game
+from duck_batch import apply_overrides
+
+
+@pytest.mark.parametrize("name", ["TICK_RATE", "DT", "GRID_CELL_SIZE", "WINDOW_WIDTH", "run_headless"])
+def test_constants_read_at_import_time_cannot_be_overridden(name):
+    with pytest.raises(ValueError):
+        apply_overrides({name: 1})
+
+
+def test_tuning_constants_are_overridden(monkeypatch):
+    monkeypatch.setattr(duck_game, "STRAW_LENGTH", duck_game.STRAW_LENGTH)
+    apply_overrides({"STRAW_LENGTH": 120})
+    assert duck_game.STRAW_LENGTH == 120
+    with pytest.raises(ValueError):
+        apply_overrides({"STRAW_LENGTH": "long"})
@@ -0,0 +1,78 @@
+import os
+import random
+import sys
+
+import numpy as np
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+import duck_game
+from duck_game import (Duck, Food, FoodGrid, FoodSwarm, check_collision, collision_candidates,
+                       get_food_sprite)
+
+
+def test_culled_swarm_draws_the_same_pixels():
+    pygame.init()
+    swarm = FoodSwarm(30000, seed=3)
+    for _ in range(3):
+        swarm.update()
+    screen = pygame.Surface((duck_game.WINDOW_WIDTH, duck_game.WINDOW_HEIGHT))
+    screen.fill(duck_game.BLUE)
+    rects = swarm.draw(screen, 0.5)
+    assert len(rects) < len(swarm) // 2  # most of the swarm is hidden and skipped
+
+    expected = pygame.Surface(screen.get_size())
+    expected.fill(duck_game.BLUE)
+    x = swarm.prev_x + (swarm.x - swarm.prev_x) * 0.5 - swarm.size
+    y = swarm.prev_y + (swarm.y - swarm.prev_y) * 0.5 - swarm.size
+    expected.blits([(get_food_sprite(score, size), (left, top))
+                    for left, top, size, score in zip(x.tolist(), y.tolist(), swarm.size.tolist(),
+                                                      swarm.score.tolist())])
+    assert np.array_equal(pygame.surfarray.array3d(screen), pygame.surfarray.array3d(expected))
+
+
+def straw_only_hit(duck, food):
+    body = Duck()
+    body.x, body.y, body.size = duck.x, duck.y, duck.size
+    return check_collision(duck, food) and not check_collision(body, food)
+
+
+def test_food_grid_finds_the_same_hits_as_a_full_scan():
+    rng = random.Random(5)
+    cell = duck_game.GRID_CELL_SIZE
+    width, height = duck_game.WINDOW_WIDTH, duck_game.WINDOW_HEIGHT
+    body_hits = straw_hits = 0
+    for trial in range(300):
+        duck = Duck()
+        duck.size = rng.choice([45, 60, 90])
+        duck.has_straw = rng.random() < 0.5
+        # Half of the ducks sit against a window edge, where the grid cells are partly outside
+        duck.x = rng.choice([duck.size, width - duck.size, rng.uniform(duck.size, width - duck.size)])
+        duck.y = rng.choice([duck.size, height - duck.size, rng.uniform(duck.size, height - duck.size)])
+
+        grid = FoodGrid(0, seed=trial)
+        for _ in range(60):
+            food = Food(rng)
+            # Around the duck and its straw, many of them right on a cell border
+            food.x = duck.x + rng.uniform(-duck.size - 30, duck.size + duck_game.STRAW_LENGTH + 30)
+            food.y = duck.y + rng.uniform(-duck.size - 30, duck.size + 30)
+            if rng.random() < 0.5:
+                food.x = round(food.x / cell) * cell + rng.choice([-0.5, 0, 0.5])
+            grid.insert(food)
+        for _ in range(rng.randrange(4)):
+            grid.update()  # foods crossing a border move to their new cell
+
+        hits = {food for food in grid if check_collision(duck, food)}
+        assert {food for food in collision_candidates(duck, grid) if check_collision(duck, food)} == hits
+        body_hits += len(hits)
+        straw_hits += sum(straw_only_hit(duck, food) for food in hits)
+
+        before = set(grid)
+        scores = grid.collect(duck)
+        assert before - set(grid) == hits
+        assert sorted(scores) == sorted(food.score for food in hits)
+        assert len(grid) == len(before)
+    assert body_hits - straw_hits > 100 and straw_hits > 100
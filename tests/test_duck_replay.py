@@ -0,0 +1,40 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from duck_batch import GreedyBot
+from duck_game import GameState, Replay, step
+
+
+def record(ticks, food_count, swarm, seed):
+    state = GameState(food_count, swarm, seed)
+    replay = Replay.for_state(state)
+    bot = GreedyBot(seed)
+    for _ in range(ticks):
+        inputs = bot(state)
+        replay.record(inputs)
+        step(state, inputs)
+    replay.finish(state)
+    return state, replay
+
+
+@pytest.mark.parametrize("food_count, swarm", [(5, False), (2000, True)])
+def test_replays_round_trip_and_verify(food_count, swarm):
+    state, replay = record(1200, food_count, swarm, 2 ** 63 + 7)
+    assert state.score > 0
+    loaded = Replay.from_bytes(replay.to_bytes())
+    assert (loaded.seed, loaded.food_count, loaded.swarm) == (state.seed, food_count, swarm)
+    assert loaded.inputs == replay.inputs and loaded.final == replay.final
+    assert loaded.verify()
+
+    loaded.inputs[10] ^= 0b0011  # left <-> right for one early tick
+    assert not loaded.verify()
+
+
+@pytest.mark.parametrize("seed", [-1, 2 ** 64])
+def test_seeds_outside_the_replay_format_are_rejected(seed):
+    with pytest.raises(ValueError):
+        GameState(5, True, seed)
@@ -0,0 +1,27 @@
+import os
+import sys
+
+import numpy as np
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from frame_profiler import FrameProfiler
+
+
+def test_erase_overlay_restores_the_scene():
+    pygame.font.init()
+    profiler = FrameProfiler(enabled=True)
+    profiler.mark("update")
+    profiler.end_frame()
+    screen = pygame.Surface((300, 200))
+    screen.fill((0, 100, 255))
+    pygame.draw.circle(screen, (255, 0, 0), (280, 180), 40)
+    before = pygame.surfarray.array3d(screen)
+    rect = profiler.draw_overlay(screen)
+    assert rect and not np.array_equal(pygame.surfarray.array3d(screen), before)
+    assert profiler.erase_overlay(screen) == rect
+    assert np.array_equal(pygame.surfarray.array3d(screen), before)
+    assert profiler.erase_overlay(screen) is None
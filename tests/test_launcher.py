@@ -0,0 +1,41 @@
+import os
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from launcher import BACKGROUND, WINDOW_HEIGHT, WINDOW_WIDTH, Launcher
+
+
+def test_dirty_rects_of_a_game_are_moved_into_the_window():
+    pygame.init()
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    launcher = Launcher(SimpleNamespace(sound_enabled=False))
+    launcher.switch_to(0)  # the duck game, which returns dirty rects
+    surface = launcher.surfaces[0]
+    area = surface.get_rect(center=screen.get_rect().center)
+
+    assert launcher.draw(screen) is None  # the first frame after a switch covers the menu
+    updated = 0
+    for _ in range(30):
+        launcher.update(1 / 60)
+        rects = launcher.draw(screen)
+        if rects is not None:
+            updated += 1
+            assert all(area.contains(rect) for rect in rects)
+        expected = pygame.Surface(screen.get_size())
+        expected.fill(BACKGROUND)
+        expected.blit(surface, area)
+        assert np.array_equal(pygame.surfarray.array3d(screen), pygame.surfarray.array3d(expected))
+    assert updated
+
+    launcher.switch_to(None)
+    launcher.switch_to(0)
+    assert launcher.draw(screen) is None
+    launcher.close()
+    pygame.quit()
@@ -0,0 +1,29 @@
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+import spaceship_assembly
+from spaceship_assembly import ASSEMBLY, LAUNCH, SpaceshipGame
+
+
+def snapshot(game):
+    return (game.current_assembly_component, game.assembly_complete, game.spaceship_y, list(game.stars),
+            [(part.position, part.is_assembled) for part in game.components])
+
+
+def test_drawing_does_not_advance_the_animation():
+    pygame.font.init()
+    screen = pygame.Surface((spaceship_assembly.WINDOW_WIDTH, spaceship_assembly.WINDOW_HEIGHT))
+    game = SpaceshipGame()
+    for state in (ASSEMBLY, LAUNCH):
+        game.state = state
+        before = snapshot(game)
+        for _ in range(5):
+            game.draw(screen)
+        assert snapshot(game) == before
+        game.update(0.5)
+        assert snapshot(game) != before
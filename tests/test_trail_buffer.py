@@ -0,0 +1,25 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from trail_buffer import TrailBuffer
+
+
+def test_rows_match_view():
+    trail = TrailBuffer(5)
+    assert trail.rows() == []
+    points = np.arange(40.0).reshape(-1, 2)
+    for x, y in points[:3]:
+        trail.append(x, y)
+    assert trail.rows() == trail.view().tolist()
+    for count in (1, 4, 2, 7, 1, 3):
+        trail.extend(points[:count] + count)
+        assert trail.rows() == trail.view().tolist()
+        trail.append(-1, -2)
+        assert trail.rows() == trail.view().tolist()
+    assert len(trail.row_list) <= 2 * trail.capacity
+    trail.clear()
+    assert trail.rows() == []
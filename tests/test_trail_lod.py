@@ -0,0 +1,33 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from trail_lod import DecimatedTrail, simplify
+
+
+def test_simplify_keeps_breaks():
+    line = np.column_stack((np.arange(10.0), np.zeros(10)))
+    points = np.concatenate((line, [(np.nan, np.nan)] * 3, line + (0, 5)))
+    simplified = simplify(points, 0.5)
+    assert len(simplified) == 5
+    assert np.isnan(simplified[2]).all()
+
+
+def test_rows_match_view():
+    trail = DecimatedTrail(chunk=4, max_points=16)
+    t = np.linspace(0, 20, 200)
+    for x, y in np.column_stack((np.cos(t) * 100, np.sin(t) * 100)):
+        trail.append(x, y)
+        assert trail.rows() == trail.view().tolist()
+
+
+def test_history_with_many_breaks_stays_bounded():
+    points = np.full((100_000, 2), np.nan)
+    points[::2] = np.column_stack((np.arange(50_000.0), np.zeros(50_000)))
+    trail = DecimatedTrail(chunk=64, max_points=1000)
+    trail.extend(points)
+    assert len(trail) <= 1000 + 2 * 64
+    assert np.isnan(trail.view()[-1]).all() and trail.view()[-2].tolist() == points[-2].tolist()
@@ -0,0 +1,57 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from trail_render import TrailCanvas, draw_gradient_trail, rasterize_trail
+
+
+@pytest.fixture
+def surface():
+    surface = pygame.Surface((200, 100), depth=32)
+    surface.fill((255, 255, 255))
+    return surface
+
+
+def painted(surface):
+    return int((pygame.surfarray.array3d(surface).sum(axis=2) < 765).sum())
+
+
+def test_non_finite_points_break_the_trail(surface):
+    rasterize_trail(surface, [(0, 0), (np.nan, 5), (50, 50), (150, 50), (np.inf, 0)], (0, 0, 0), (255, 0, 0))
+    assert painted(surface) == 101  # only the finite segment (50, 50)-(150, 50)
+
+
+def test_huge_and_off_screen_segments_are_clipped(surface):
+    rasterize_trail(surface, [(-1e7, -5), (1e7, -5), (5, 1e7)], (0, 0, 0), (255, 0, 0), 3)
+    assert painted(surface) == 0
+    rasterize_trail(surface, [(0, 0), (5e9, 3e9)], (0, 0, 0), (255, 0, 0))
+    rasterize_trail(surface, [(-1e12, 50), (1e12, 50)], (0, 0, 0), (255, 0, 0))
+    assert painted(surface) > 200
+
+
+def test_gradient_trail_and_canvas_break_at_non_finite_points(surface):
+    points = np.array([(10, 10), (10, 90), (np.nan, np.nan), (190, 10), (190, 90)], float)
+    draw_gradient_trail(surface, points, (0, 0, 0), (255, 0, 0))
+    assert painted(surface) == 162  # two vertical lines, nothing across the break
+    for build in ("rebuild", "add_points", "add_point"):
+        canvas = TrailCanvas(surface.get_size(), (0, 0, 0), (255, 0, 0))
+        if build == "rebuild":
+            canvas.rebuild(points)
+        elif build == "add_points":
+            canvas.add_points(points[:2])
+            canvas.add_points(points[2:])
+        else:
+            for x, y in points:
+                canvas.add_point(x, y)
+        target = pygame.Surface(surface.get_size(), depth=32)
+        target.fill((255, 255, 255))
+        canvas.draw(target)
+        assert painted(target) == 162, build
+
@@ -0,0 +1,78 @@
+"""
+Fixed-capacity ring buffer for animation trails.
+
+Points live in one preallocated (2 * capacity, 2) float array. Every point
+is written twice, at slot i and slot i + capacity, so the points from oldest
+to newest are always one contiguous slice. view() returns that slice
+without copying, and append() and eviction are O(1) with no allocation,
+whatever the capacity (16 bytes per point of capacity with float32, 32 with
+the default float64). rows() returns the same points as a Python list, the
+form pygame.draw takes. The list is kept between calls and only the points
+added since the last call are converted, so a renderer does not convert
+the whole trail every frame.
+"""
+import numpy as np
+
+
+class TrailBuffer:
+    def __init__(self, capacity, dtype=np.float64):
+        if capacity < 1:
+            raise ValueError("TrailBuffer capacity must be at least 1")
+        self.capacity = capacity
+        self.data = np.empty((2 * capacity, 2), dtype)
+        self.start = 0  # slot of the oldest point
+        self.length = 0
+        self.row_list = []  # rows() so far, with older points in front; trimmed at 2 * capacity
+        self.pending = 0  # points added since row_list was last brought up to date
+
+    def __len__(self):
+        return self.length
+
+    def append(self, x, y):
+        slot = (self.start + self.length) % self.capacity
+        self.data[slot] = self.data[slot + self.capacity] = (x, y)
+        self.pending += 1
+        if self.length < self.capacity:
+            self.length += 1
+        else:
+            # Full: the new point overwrote the oldest one
+            self.start = (self.start + 1) % self.capacity
+
+    def extend(self, points):
+        # Append an (n, 2) array of points in one vectorized write
+        points = np.asarray(points, self.data.dtype).reshape(-1, 2)
+        count = len(points)
+        self.pending += count
+        if count >= self.capacity:
+            # Only the newest capacity points survive
+            self.data[:self.capacity] = self.data[self.capacity:] = points[-self.capacity:]
+            self.start = 0
+            self.length = self.capacity
+            return
+        slots = (self.start + self.length + np.arange(count)) % self.capacity
+        self.data[slots] = points
+        self.data[slots + self.capacity] = points
+        overflow = max(0, self.length + count - self.capacity)
+        self.length = min(self.capacity, self.length + count)
+        self.start = (self.start + overflow) % self.capacity
+
+    def clear(self):
+        self.start = 0
+        self.length = 0
+        self.row_list = []
+        self.pending = 0
+
+    def view(self):
+        # Oldest to newest, shape (len, 2); only valid until the next append
+        return self.data[self.start:self.start + self.length]
+
+    def rows(self):
+        # The points of view() as a list of [x, y] lists
+        if self.pending >= self.length:
+            self.row_list = self.view().tolist()
+        elif self.pending:
+            self.row_list.extend(self.view()[self.length - self.pending:].tolist())
+            if len(self.row_list) > 2 * self.capacity:
+                del self.row_list[:-self.capacity]
+        self.pending = 0
+        return self.row_list[len(self.row_list) - self.length:]
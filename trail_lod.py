@@ -0,0 +1,141 @@
+"""
+Unbounded trail history with level-of-detail decimation.
+
+DecimatedTrail keeps every point a curve has drawn, not just the newest
+capacity points like TrailBuffer, and has the same interface (append,
+extend, clear, view, len). The newest points are kept raw. Each time
+LOD_CHUNK more arrive, the oldest raw chunk is simplified with
+Douglas-Peucker: a point is dropped when the simplified line passes within
+`tolerance` pixels of it, so the simplified history looks the same on
+screen. If the history still grows past max_points, the tolerance is
+doubled and the history simplified again. rows() is view() as a Python list,
+with the simplified history converted only when it changes. Memory and the cost of drawing
+view() are therefore bounded however many points are added, and the whole
+curve stays visible. Non-finite points (breaks in the trail) are kept, and
+the finite stretches between them are simplified separately. Breaks cannot
+be simplified away, so when a coarser tolerance no longer shrinks the
+history, its oldest half is dropped instead.
+"""
+import numpy as np
+
+LOD_TOLERANCE = 0.5  # pixels: below what a 1-3 pixel wide line can show
+LOD_CHUNK = 256  # raw points simplified at a time
+LOD_MAX_POINTS = 20000  # points kept in the simplified history
+
+
+def simplify(points, tolerance):
+    # Douglas-Peucker on an (n, 2) array; the first and last points are always kept
+    count = len(points)
+    if count < 3:
+        return points.copy()
+    finite = np.isfinite(points).all(axis=1)
+    if not finite.all():
+        pieces = []
+        start = 0
+        for gap in np.flatnonzero(~finite):
+            pieces.append(simplify(points[start:gap], tolerance))
+            if gap == 0 or finite[gap - 1]:
+                pieces.append(points[gap:gap + 1])  # one point per break is enough
+            start = gap + 1
+        pieces.append(simplify(points[start:], tolerance))
+        return np.concatenate(pieces)
+    keep = np.zeros(count, bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, count - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        start = points[first]
+        direction = points[last] - start
+        offsets = points[first + 1:last] - start
+        # Distance to the segment (not the infinite line), so a curve that doubles back is kept
+        length2 = direction @ direction
+        if length2 > 0:
+            along = np.clip(offsets @ direction / length2, 0.0, 1.0)
+            offsets = offsets - along[:, None] * direction
+        distance = np.hypot(offsets[:, 0], offsets[:, 1])
+        farthest = int(distance.argmax())
+        if distance[farthest] > tolerance:
+            middle = first + 1 + farthest
+            keep[middle] = True
+            stack.append((first, middle))
+            stack.append((middle, last))
+    return points[keep]
+
+
+class DecimatedTrail:
+    def __init__(self, tolerance=LOD_TOLERANCE, chunk=LOD_CHUNK, max_points=LOD_MAX_POINTS, dtype=np.float64):
+        if chunk < 2 or max_points < 2 * chunk:
+            raise ValueError("DecimatedTrail needs chunk >= 2 and max_points >= 2 * chunk")
+        self.initial_tolerance = tolerance
+        self.chunk = chunk
+        self.max_points = max_points
+        # Simplified history first, then at most 2 * chunk raw points
+        self.data = np.empty((max_points + 2 * chunk, 2), dtype)
+        self.clear()
+
+    def __len__(self):
+        return self.length
+
+    def clear(self):
+        self.tolerance = self.initial_tolerance
+        self.history = 0  # points in data that are already simplified
+        self.history_rows = None  # data[:history] as a list, converted on demand
+        self.length = 0
+        self.total = 0  # raw points added since the last clear
+
+    def append(self, x, y):
+        if self.length - self.history == 2 * self.chunk:
+            self.compact()
+        self.data[self.length] = (x, y)
+        self.length += 1
+        self.total += 1
+
+    def extend(self, points):
+        points = np.asarray(points, self.data.dtype).reshape(-1, 2)
+        while len(points):
+            if self.length - self.history == 2 * self.chunk:
+                self.compact()
+            room = 2 * self.chunk - (self.length - self.history)
+            batch = points[:room]
+            self.data[self.length:self.length + len(batch)] = batch
+            self.length += len(batch)
+            self.total += len(batch)
+            points = points[room:]
+
+    def compact(self):
+        # Simplify the oldest raw chunk onto the history; its first point is the history's last,
+        # so the join between the two stays exact
+        first = max(self.history - 1, 0)
+        end = self.history + self.chunk
+        simplified = simplify(self.data[first:end], self.tolerance)
+        raw = self.data[end:self.length].copy()
+        self.data[first:first + len(simplified)] = simplified
+        self.history = first + len(simplified)
+        while self.history > self.max_points - self.chunk:
+            # Too detailed to stay bounded: halve the level of detail of the whole history
+            previous = self.history
+            if np.isfinite(self.tolerance * 2):
+                self.tolerance *= 2
+                simplified = simplify(self.data[:self.history], self.tolerance)
+                self.data[:len(simplified)] = simplified
+                self.history = len(simplified)
+            if self.history >= previous:
+                # Only breaks and stretch ends are left: keep the newest half of the history
+                keep = (self.max_points - self.chunk) // 2
+                self.data[:keep] = self.data[self.history - keep:self.history].copy()
+                self.history = keep
+        self.data[self.history:self.history + len(raw)] = raw
+        self.length = self.history + len(raw)
+        self.history_rows = None
+
+    def view(self):
+        # Oldest to newest, shape (len, 2); only valid until the next append
+        return self.data[:self.length]
+
+    def rows(self):
+        # The points of view() as a list of [x, y] lists
+        if self.history_rows is None:
+            self.history_rows = self.data[:self.history].tolist()
+        return self.history_rows + self.data[self.history:self.length].tolist()
@@ -0,0 +1,310 @@
+"""
+Batched gradient trail rendering.
+
+A trail fades from start_color at its oldest point to end_color at its
+newest. Instead of one pygame.draw.line call with its own interpolated color
+per segment, the gradient is quantized into a few color bands taken from a
+cached lookup table, and each band is drawn with a single pygame.draw.lines
+call: TRAIL_BANDS calls per frame however long the trail is. Every renderer
+breaks the trail at points that are not finite (where a curve is undefined).
+
+rasterize_trail() does without pygame.draw altogether: every segment is
+clipped to the surface (Liang-Barsky) and stepped at one sample per pixel
+in a few NumPy operations, each segment gets its own exact gradient color,
+and the samples are written straight into a pixels2d view of the target
+surface (32 bits per pixel, like the game windows). It costs about the same as the band calls for a sparse
+trail and is several times faster for dense ones, where converting the
+points to a list for pygame.draw dominates.
+"""
+from functools import lru_cache
+
+import numpy as np
+import pygame
+
+TRAIL_BANDS = 32  # enough that the steps between bands are not visible
+RENDER_MODES = ("batched", "raster", "incremental")  # the trail renderers the curve scenes cycle through
+FADE_EVERY = 4  # TrailCanvas: points between two fade passes
+
+
+@lru_cache(maxsize=64)
+def gradient_lut(start_color, end_color, bands=TRAIL_BANDS):
+    # Color of each band, sampled at the middle of the band
+    lut = []
+    for band in range(bands):
+        alpha = (band + 0.5) / bands
+        lut.append(tuple(int(end * alpha + start * (1 - alpha)) for start, end in zip(start_color, end_color)))
+    return tuple(lut)
+
+
+def gradient_bands(count, start_color, end_color, bands=TRAIL_BANDS):
+    # (first, last, color) for each band, oldest first: the band covers points[first:last + 1]
+    # and consecutive bands share an end point
+    segments = count - 1
+    if segments < 1:
+        return []
+    lut = gradient_lut(tuple(start_color), tuple(end_color), bands)
+    bands = min(bands, segments)
+    result = []
+    first = 0
+    for band in range(bands):
+        last = (band + 1) * segments // bands
+        result.append((first, last, lut[(2 * band + 1) * len(lut) // (2 * bands)]))
+        first = last
+    return result
+
+
+def finite_runs(points):
+    # (first, last) of each stretch of consecutive finite points, as inclusive indices
+    finite = np.isfinite(np.asarray(points, np.float64).reshape(-1, 2))
+    if finite.all():
+        return [(0, len(finite) - 1)]
+    finite = finite.all(axis=1)
+    edges = np.diff(np.concatenate(([False], finite, [False])).astype(np.int8))
+    return list(zip(np.flatnonzero(edges == 1).tolist(), (np.flatnonzero(edges == -1) - 1).tolist()))
+
+
+def split_runs(runs, first, last):
+    # The parts of points[first:last + 1] inside the runs that have at least one segment
+    for start, end in runs:
+        start = max(start, first)
+        end = min(end, last)
+        if start < end:
+            yield start, end
+
+
+def draw_gradient_trail(screen, points, start_color, end_color, width=1, bands=TRAIL_BANDS, rows=None):
+    # points: oldest to newest, a list of (x, y) or an (n, 2) array. rows: returns the same points as
+    # a list, when the caller keeps one (TrailBuffer.rows); converting a long array costs more than drawing it
+    if len(points) < 2:
+        return
+    runs = finite_runs(points)
+    if rows is not None:
+        points = rows()
+    elif not isinstance(points, list):
+        points = points.tolist()
+    for first, last, color in gradient_bands(len(points), start_color, end_color, bands):
+        for start, end in split_runs(runs, first, last):
+            pygame.draw.lines(screen, color, False, points[start:end + 1], width)
+
+
+def clip_segments(x0, y0, x1, y1, left, top, right, bottom):
+    # Vectorized Liang-Barsky: each segment cut to the rectangle; returns (x0, y0, x1, y1, kept)
+    # where kept marks the segments that touch the rectangle at all
+    dx = x1 - x0
+    dy = y1 - y0
+    start = np.zeros(len(dx))
+    end = np.ones(len(dx))
+    kept = np.ones(len(dx), bool)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for p, q in ((-dx, x0 - left), (dx, right - x0), (-dy, y0 - top), (dy, bottom - y0)):
+            # Parallel to this edge and outside it: nothing is visible
+            kept &= (p != 0) | (q >= 0)
+            ratio = q / p
+            entering = p < 0
+            leaving = p > 0
+            start = np.where(entering, np.maximum(start, ratio), start)
+            end = np.where(leaving, np.minimum(end, ratio), end)
+    kept &= start <= end
+    return x0 + start * dx, y0 + start * dy, x0 + end * dx, y0 + end * dy, kept
+
+
+def rasterize_trail(screen, points, start_color, end_color, width=1, rows=None):
+    # Same arguments as draw_gradient_trail (rows is not needed), but no Python loop over segments or bands
+    points = np.asarray(points, np.float64).reshape(-1, 2)
+    segments = len(points) - 1
+    if segments < 1:
+        return
+    # The trail breaks at non-finite points, and everything is clipped before it is stepped,
+    # so the samples are bounded by the clip area however long or far away a segment is
+    x = points[:, 0]
+    y = points[:, 1]
+    finite = np.isfinite(x) & np.isfinite(y)
+    index = np.flatnonzero(finite[:-1] & finite[1:])
+    x0, y0, x1, y1 = x[index], y[index], x[index + 1], y[index + 1]
+    clip = screen.get_clip()
+    margin = width // 2 + 1  # a thick line just outside the clip area can still reach into it
+    left, top = clip.left - margin, clip.top - margin
+    right, bottom = clip.right - 1 + margin, clip.bottom - 1 + margin
+    start_outside = (x0 < left) | (x0 > right) | (y0 < top) | (y0 > bottom)
+    end_outside = (x1 < left) | (x1 > right) | (y1 < top) | (y1 > bottom)
+    crossing = np.flatnonzero(start_outside | end_outside)
+    if len(crossing):
+        # Only segments with an end outside the clip area need cutting
+        cx0, cy0, cx1, cy1, kept = clip_segments(x0[crossing], y0[crossing], x1[crossing], y1[crossing],
+                                                 left, top, right, bottom)
+        x0[crossing], y0[crossing], x1[crossing], y1[crossing] = cx0, cy0, cx1, cy1
+        visible = np.ones(len(index), bool)
+        visible[crossing] = kept
+        index, x0, y0, x1, y1 = index[visible], x0[visible], y0[visible], x1[visible], y1[visible]
+        end_outside = end_outside[visible]
+    if len(index) == 0:
+        return
+    dx = x1 - x0
+    dy = y1 - y0
+    # One sample per pixel along the longer axis, from the start of each segment; its end is the
+    # next segment's start, so it only gets a sample of its own where the trail breaks or is clipped
+    lengths = np.maximum(np.ceil(np.maximum(np.abs(dx), np.abs(dy))), 1).astype(np.intp)
+    closes = end_outside.copy()
+    closes[:-1] |= index[1:] != index[:-1] + 1
+    closes[-1] = True
+    steps = lengths + closes
+    sample = np.repeat(np.arange(len(index)), steps)
+    along = (np.arange(len(sample)) - np.repeat(np.cumsum(steps) - steps, steps)) / lengths[sample]
+    x = np.rint(x0[sample] + along * dx[sample]).astype(np.intp)
+    y = np.rint(y0[sample] + along * dy[sample]).astype(np.intp)
+    # Dense trails put many samples on the same pixel: keep the last of each run
+    moved = np.ones(len(x), bool)
+    moved[:-1] = (x[1:] != x[:-1]) | (y[1:] != y[:-1])
+    x = x[moved]
+    y = y[moved]
+    sample = sample[moved]
+    # Mostly horizontal segments are thickened vertically and the others horizontally
+    horizontal = (np.abs(dx) >= np.abs(dy))[sample]
+
+    fraction = (index + 0.5) / segments
+    rgb = (np.asarray(start_color) + np.outer(fraction, np.subtract(end_color, start_color))).astype(np.uint32)
+    red, green, blue, _ = screen.get_shifts()
+    colors = (rgb[:, 0] << red | rgb[:, 1] << green | rgb[:, 2] << blue | screen.get_masks()[3])[sample]
+    if width > 1:
+        # A run of width pixels across the segment at every sample, as pygame.draw.line does
+        brush = np.arange(width) - width // 2
+        x = (x[:, None] + np.outer(~horizontal, brush)).ravel()
+        y = (y[:, None] + np.outer(horizontal, brush)).ravel()
+        colors = np.repeat(colors, width)
+    inside = (x >= clip.left) & (x < clip.right) & (y >= clip.top) & (y < clip.bottom)
+    pixels = pygame.surfarray.pixels2d(screen)
+    # Later samples win where they overlap, so newer segments are drawn over older ones
+    pixels[x[inside], y[inside]] = colors[inside]
+    del pixels  # releases the surface lock
+
+
+TRAIL_RENDERERS = {"batched": draw_gradient_trail, "raster": rasterize_trail}
+
+
+def next_render_mode(mode):
+    return RENDER_MODES[(RENDER_MODES.index(mode) + 1) % len(RENDER_MODES)]
+
+
+class TrailCanvas:
+    """
+    Incremental trail rendering on a persistent off-screen canvas.
+
+    Each new point draws only its own segment, twice: in old_color on an
+    opaque base layer and in new_color on a glow layer. Before that the glow
+    layer's alpha is lowered by one fade step, so a segment shifts from
+    new_color to old_color over about fade_points points. Per-frame cost
+    depends on the area the trail covers, not on its length. rebuild()
+    redraws the whole canvas from a list of points and is only needed when
+    the points themselves change (reset, curve switch, scale change).
+    Points a bounded trail has already dropped stay on the canvas until then.
+    """
+
+    def __init__(self, size, old_color, new_color, width=1, fade_points=255):
+        self.old_color = old_color
+        self.new_color = new_color
+        self.width = width
+        # Fade in steps of at least FADE_EVERY points: each fade pass touches the whole trail area
+        self.fade_every = max(FADE_EVERY, round(fade_points / 255))
+        self.fade_step = max(1, round(255 * self.fade_every / fade_points))
+        self.base = pygame.Surface(size, pygame.SRCALPHA)
+        self.glow = pygame.Surface(size, pygame.SRCALPHA)
+        self.reset()
+
+    def reset(self):
+        self.base.fill((0, 0, 0, 0))
+        self.glow.fill((0, 0, 0, 0))
+        self.bounds = None  # area touched since the last reset
+        self.last_point = None
+        self.count = 0
+
+    def add_point(self, x, y):
+        point = (x, y)
+        if not (np.isfinite(x) and np.isfinite(y)):
+            point = None  # a break in the trail
+        elif self.last_point is not None:
+            if self.count % self.fade_every == 0:
+                self.fade()
+            self.add_segment(self.last_point, point)
+        self.last_point = point
+        self.count += 1
+
+    def add_points(self, points):
+        # Several new points at once (a late frame catching up): the fades they would have
+        # triggered are applied together, then the new stretch is one draw call per layer
+        count = len(points)
+        if count == 0:
+            return
+        if not isinstance(points, list):
+            points = points.tolist()
+        first = max(self.count, 1)
+        last = self.count + count - 1
+        fades = last // self.fade_every - (first - 1) // self.fade_every
+        if fades > 0:
+            self.fade(fades)
+        if self.last_point is not None:
+            points = [self.last_point] + points
+        runs = finite_runs(points)
+        for start, end in split_runs(runs, 0, len(points) - 1):
+            pygame.draw.lines(self.base, self.old_color, False, points[start:end + 1], self.width)
+            self.extend(pygame.draw.lines(self.glow, self.new_color, False, points[start:end + 1], self.width))
+        self.last_point = self.end_point(points, runs)
+        self.count += count
+
+    def fade(self, steps=1):
+        # Fade steps for everything drawn so far: a saturating subtract on the alpha channel,
+        # done in place with NumPy (several times faster than a BLEND_RGBA_SUB fill)
+        if self.bounds is not None:
+            bounds = self.bounds
+            amount = min(255, steps * self.fade_step)
+            alpha = pygame.surfarray.pixels_alpha(self.glow)[bounds.left:bounds.right, bounds.top:bounds.bottom]
+            np.maximum(alpha, amount, out=alpha)
+            alpha -= amount
+            del alpha  # releases the surface lock
+
+    def add_segment(self, start, end, new_color=None, old_color=None):
+        # Lower-level than add_point: several trails (each with its own colors) can share a canvas
+        pygame.draw.line(self.base, old_color or self.old_color, start, end, self.width)
+        self.extend(pygame.draw.line(self.glow, new_color or self.new_color, start, end, self.width))
+
+    def stamp(self, surface, position):
+        # Static decoration (e.g. a label) drawn once onto the base layer
+        self.extend(self.base.blit(surface, position))
+
+    def extend(self, rect):
+        self.bounds = rect if self.bounds is None else self.bounds.union(rect)
+
+    def rebuild(self, points):
+        # Redraw everything at once, with the fade each segment would have by now
+        self.reset()
+        count = len(points)
+        if count < 2:
+            if count:
+                self.add_point(*points[0])
+            return
+        runs = finite_runs(points)
+        if not isinstance(points, list):
+            points = points.tolist()
+        for start, end in split_runs(runs, 0, count - 1):
+            self.extend(pygame.draw.lines(self.base, self.old_color, False, points[start:end + 1], self.width))
+        segments = count - 1
+        for start in range(0, segments, self.fade_every):
+            # Segments older than the newest fade_every share one alpha level
+            age = (segments - 1 - start) // self.fade_every
+            alpha = 255 - age * self.fade_step
+            if alpha <= 0:
+                continue
+            for first, last in split_runs(runs, start, min(start + self.fade_every, segments)):
+                pygame.draw.lines(self.glow, (*self.new_color, alpha), False, points[first:last + 1], self.width)
+        self.last_point = self.end_point(points, runs)
+        self.count = count
+
+    def end_point(self, points, runs):
+        # Where the next segment starts: the last point, unless the trail breaks there
+        if runs and runs[-1][1] == len(points) - 1:
+            return tuple(points[-1])
+        return None
+
+    def draw(self, screen):
+        if self.bounds is not None:
+            screen.blit(self.base, self.bounds.topleft, self.bounds)
+            screen.blit(self.glow, self.bounds.topleft, self.bounds)